@@ -0,0 +1,60 @@
+"""Counts allocations made while rendering prebuilt fragments
+
+Rendering a prebuilt query should allocate only the output buffer and
+params: interpolation wrappers of compound children are created once.
+
+Usage: PYTHONPATH=. python bench/alloc.py
+"""
+
+import tracemalloc
+from typing import Any, List
+
+import sqlbind_t
+from sqlbind_t import SET, SQL, WHERE, E, in_range
+from sqlbind_t.dialect import render
+from sqlbind_t.template import Interpolation
+
+COUNT = 1000
+
+
+class Counter:
+    def __init__(self, wrapped: Any) -> None:
+        self.wrapped = wrapped
+        self.calls = 0
+
+    def __call__(self, value: object) -> Any:
+        self.calls += 1
+        return self.wrapped(value)
+
+
+def query() -> SQL:
+    cond = [E.t('c%d' % i) == i for i in range(20)]
+    where = WHERE(in_range(E.d, 1, 10), *cond, (E.e == 1) | (E.f == 2))
+    return SQL('UPDATE t ', Interpolation(SET(a=1, b=2)), ' ', Interpolation(where))
+
+
+def main() -> None:
+    counter = Counter(Interpolation)
+    setattr(sqlbind_t, 'Interpolation', counter)
+    try:
+        q = query()
+        sql, params = render(q)
+        built = counter.calls
+
+        tracemalloc.start()
+        results: List[object] = [render(q) for _ in range(COUNT)]
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        setattr(sqlbind_t, 'Interpolation', Interpolation)
+
+    rerender = counter.calls - built
+    print(f'wrappers on first render: {built}, on {COUNT} re-renders: {rerender}')
+    print(f'retained per render: {current / COUNT:.0f} B, peak: {peak / COUNT:.0f} B')
+    print(f'output: {len(sql)} chars, {len(params)} params')
+    assert rerender == 0, rerender
+    del results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Peak memory and time of rendering 1M-element IN lists from arrays
+
+Compares a list of ints with array.array and NumPy (if installed) inputs
+for sqlite inlined literals and a single bound parameter.
+
+Usage: PYTHONPATH=. python bench/arrays.py
+"""
+
+import time
+import tracemalloc
+from array import array
+from typing import Callable, List, Tuple
+
+from sqlbind_t import E, sqlite
+from sqlbind_t.dialect import Dialect
+
+SIZE = 1000000
+
+
+def measure(make: Callable[[], object], render: Callable[[object], object]) -> Tuple[float, float]:
+    value = make()
+    start = time.perf_counter()
+    render(value)
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    render(value)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, duration
+
+
+def main() -> None:
+    inputs: List[Tuple[str, Callable[[], object]]] = [
+        ('list', lambda: list(range(SIZE))),
+        ('array.array', lambda: array('q', range(SIZE))),
+    ]
+    try:
+        import numpy
+    except ImportError:
+        print('numpy is not installed')
+    else:
+        inputs.append(('numpy', lambda: numpy.arange(SIZE)))
+
+    sdialect = sqlite.Dialect()
+    dialect = Dialect()
+    ids = E.id
+    renders: List[Tuple[str, Callable[[object], object]]] = [
+        ('sqlite inline', lambda v: sdialect.render(ids.IN(v))),  # type: ignore[arg-type]
+        ('bound param', lambda v: dialect.render(ids.IN(v))),  # type: ignore[arg-type]
+    ]
+    for rname, render in renders:
+        for iname, make in inputs:
+            peak, duration = measure(make, render)
+            print(f'{rname:14} {iname:12} peak: {peak:7.1f} MiB  time: {duration * 1000:7.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
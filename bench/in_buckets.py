@@ -0,0 +1,57 @@
+"""Shows statement cache reuse of sqlite IN lists with and without size buckets
+
+Hit rates are computed by replaying statement texts through an LRU of
+sqlite3 default `cached_statements` size.
+
+Usage: PYTHONPATH=. python bench/in_buckets.py
+"""
+
+import random
+import sqlite3
+import time
+from typing import List, Optional, Sequence, Union
+
+from sqlbind_t import SQL, E, sqlite
+from sqlbind_t.cache import LRUCache
+
+CACHED_STATEMENTS = 128
+
+
+def run(buckets: Union[None, str, Sequence[int]], lists: List[List[int]]) -> None:
+    dialect = sqlite.Dialect()
+    dialect.IN_MAX_VALUES = 1000
+    dialect.IN_BUCKETS = buckets
+
+    conn = sqlite3.connect(':memory:', cached_statements=CACHED_STATEMENTS)
+    conn.execute('CREATE TABLE t (id INTEGER PRIMARY KEY, name)')
+    conn.executemany('INSERT INTO t VALUES (?, ?)', ((it, str(it)) for it in range(10000)))
+
+    cache: LRUCache[str, bool] = LRUCache(CACHED_STATEMENTS)
+    statements = set()
+    start = time.perf_counter()
+    for values in lists:
+        query = SQL('SELECT name FROM t WHERE ', *(E.id.IN(values) & (E.name != '')))
+        sql, params = dialect.render(query)
+        statements.add(sql)
+        if cache.get(sql) is None:
+            cache.set(sql, True)
+        conn.execute(sql, params).fetchall()
+    elapsed = time.perf_counter() - start
+
+    hit_rate = cache.hits / len(lists) * 100
+    print(
+        f'{str(buckets):30} statements: {len(statements):4}  hit rate: {hit_rate:5.1f}%'
+        f'  {elapsed / len(lists) * 1e6:7.1f}us/query'
+    )
+
+
+def main() -> None:
+    rnd = random.Random(42)
+    lists = [rnd.sample(range(10000), rnd.randint(1, 1000)) for _ in range(3000)]
+    ladder: Optional[Sequence[int]] = (8, 32, 128, 256, 512, 1000)
+    for buckets in [None, 'pow2', ladder]:
+        run(buckets, lists)
+
+
+if __name__ == '__main__':
+    main()
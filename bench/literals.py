@@ -0,0 +1,49 @@
+"""Compares literal list rendering with per value escaping
+
+Baseline is the previous sqlite implementation: a `type()` dispatch for
+each value.
+
+Usage: PYTHONPATH=. python bench/literals.py
+"""
+
+import timeit
+from typing import List, Tuple, Union
+
+from sqlbind_t.sqlite import LITERALS
+
+SIZE = 100000
+
+
+def escape(val: Union[float, int, str]) -> str:
+    tval = type(val)
+    if tval is str:
+        return "'{}'".format(val.replace("'", "''"))  # type: ignore[union-attr]
+    elif tval is int or tval is float:
+        return str(val)
+    raise ValueError(f'Invalid type: {val}')
+
+
+def baseline(values: List[Union[float, int, str]]) -> str:
+    return ','.join(map(escape, values))
+
+
+def main() -> None:
+    cases: List[Tuple[str, List[Union[float, int, str]]]] = [
+        ('int', list(range(SIZE))),
+        ('float', [it / 3 for it in range(SIZE)]),
+        ('str', [f'name{it}' for it in range(SIZE)]),
+        ('str quoted', [f"it's {it}" for it in range(SIZE)]),
+        ('mixed', [it if it % 2 else str(it) for it in range(SIZE)]),
+    ]
+    for name, values in cases:
+        assert baseline(values) == LITERALS.literal_list(values)
+        t_base = min(timeit.repeat(lambda: baseline(values), number=5, repeat=3)) / 5
+        t_new = min(timeit.repeat(lambda: LITERALS.literal_list(values), number=5, repeat=3)) / 5
+        print(
+            f'{name:10} per value: {t_base * 1000:6.1f}ms'
+            f'  literals: {t_new * 1000:6.1f}ms  x{t_base / t_new:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Measures memory allocated to build and render typical queries
+
+Reports peak traced bytes per query while many queries are alive at once,
+which is how node size affects a busy process.
+
+Usage: PYTHONPATH=. python bench/memory.py
+"""
+
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from sqlbind_t import SQL, VALUES, WHERE, E, not_none
+from sqlbind_t.dialect import render
+
+COUNT = 10000
+
+
+def where(i: int) -> SQL:
+    return WHERE(E.users.id == i, E.users.name != 'boo', E.users.age > not_none / i, deleted=None)
+
+
+def values(i: int) -> SQL:
+    return SQL('INSERT INTO users ', *VALUES(id=i, name='boo', age=i))
+
+
+def in_list(i: int) -> SQL:
+    return WHERE(E.users.id.IN([i, i + 1, i + 2]), E.users.tag.LIKE('{}%', 'a_b'))
+
+
+def measure(build: Callable[[int], SQL]) -> Tuple[float, float]:
+    tracemalloc.start()
+    queries: List[SQL] = [build(i) for i in range(COUNT)]
+    built, _ = tracemalloc.get_traced_memory()
+    rendered = [render(q) for q in queries]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rendered
+    return built / COUNT, peak / COUNT
+
+
+def main() -> None:
+    for name, build in [('WHERE', where), ('VALUES', values), ('IN/LIKE', in_list)]:
+        built, peak = measure(build)
+        print(f'{name:8} built: {built:7.0f} B/query  peak with render: {peak:7.0f} B/query')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Overhead of render profiling hooks
+
+Compares `Dialect.render` without a profiler to a copy of render without
+the profiler check, and to render with profiling enabled.
+
+Usage: PYTHONPATH=. python bench/profile.py
+"""
+
+import timeit
+from typing import List, Optional, Tuple
+
+from sqlbind_t import WHERE, E
+from sqlbind_t.dialect import Dialect
+from sqlbind_t.query_params import QMarkQueryParams
+
+NUMBER = 20000
+
+
+def bare(
+    dialect: Dialect, q: object, params: Optional[QMarkQueryParams] = None
+) -> Tuple[str, QMarkQueryParams]:
+    lparams = QMarkQueryParams() if params is None else params
+    out: List[str] = []
+    dialect._write(q, lparams, out)  # type: ignore[arg-type]
+    return ''.join(out), lparams
+
+
+def best(fn: object) -> float:
+    return min(timeit.repeat(fn, number=NUMBER, repeat=7)) / NUMBER  # type: ignore[arg-type]
+
+
+def main() -> None:
+    dialect = Dialect()
+    q = WHERE(E.a == 1, E.b.IN([1, 2, 3]), E.c.LIKE('{}%', 'x'), (E.d > 1) | (E.e < 2), f=None)
+    assert bare(dialect, q) == dialect.render(q)
+
+    t_bare = best(lambda: bare(dialect, q))
+    t_off = best(lambda: dialect.render(q))
+    with dialect.profile():
+        t_on = best(lambda: dialect.render(q))
+
+    overhead = t_off / t_bare - 1
+    print(f'without hook:      {t_bare * 1e6:6.2f}us')
+    print(f'profiler disabled: {t_off * 1e6:6.2f}us  {overhead:+.1%}')
+    print(f'profiler enabled:  {t_on * 1e6:6.2f}us  {t_on / t_bare - 1:+.1%}')
+    assert overhead < 0.05, overhead
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Compares a recursive walk with stack based `Dialect._write`
+
+Also compares rendering a shared fragment with its frozen version.
+
+Usage: PYTHONPATH=. python bench/render.py
+"""
+
+import timeit
+from typing import Callable, Iterator, List
+
+from sqlbind_t import AND, OR, SQL, WHERE, AnySQL, E, Expr, freeze
+from sqlbind_t.dialect import Dialect, DialectOp
+from sqlbind_t.query_params import QMarkQueryParams, QueryParams
+from sqlbind_t.template import Interpolation, Template
+
+
+def wide(n: int) -> SQL:
+    return WHERE(*(getattr(E, f'f{i}') == i for i in range(n)))
+
+
+def deep(n: int) -> SQL:
+    q = E.f == 0
+    for i in range(n):
+        q = (AND if i % 2 else OR)(q, getattr(E, f'f{i}') == i)
+    return q
+
+
+def walk(dialect: Dialect, query: AnySQL, params: QueryParams) -> Iterator[str]:
+    """Recursive reference renderer `Dialect._write` replaced"""
+    for it in query:
+        if type(it) is str:
+            yield it
+        else:
+            value = it.value  # type: ignore[union-attr]
+            if isinstance(value, (Template, SQL)):
+                yield from walk(dialect, value, params)
+            elif isinstance(value, DialectOp):
+                yield value.render(params, dialect)
+            elif isinstance(value, Expr):
+                yield value._left
+            else:
+                yield params.compile(value)
+
+
+def render_walk(dialect: Dialect, q: SQL) -> str:
+    return ''.join(walk(dialect, q, QMarkQueryParams()))
+
+
+def write(dialect: Dialect, q: SQL) -> str:
+    out: List[str] = []
+    dialect._write(q, QMarkQueryParams(), out)
+    return ''.join(out)
+
+
+def best(fn: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    dialect = Dialect()
+    cases = [('wide-50', wide(50), 5000), ('deep-50', deep(50), 5000), ('deep-500', deep(500), 200)]
+    for name, q, number in cases:
+        assert render_walk(dialect, q) == write(dialect, q)
+        t_walk = timeit.timeit(lambda: render_walk(dialect, q), number=number)
+        t_write = timeit.timeit(lambda: write(dialect, q), number=number)
+        print(
+            f'{name:10} walk: {t_walk / number * 1e6:8.1f}us'
+            f'  write: {t_write / number * 1e6:8.1f}us  x{t_walk / t_write:.2f}'
+        )
+
+    shared = wide(20)
+    plain = SQL('SELECT * FROM t ', Interpolation(shared), ' AND id = ', Interpolation(1))
+    frozen = SQL('SELECT * FROM t ', Interpolation(freeze(shared)), ' AND id = ', Interpolation(1))
+    assert dialect.render(plain) == dialect.render(frozen)
+    t_plain = timeit.timeit(lambda: dialect.render(plain), number=5000)
+    t_frozen = timeit.timeit(lambda: dialect.render(frozen), number=5000)
+    print(
+        f'{"freeze-20":10} plain: {t_plain / 5000 * 1e6:7.1f}us'
+        f'  frozen: {t_frozen / 5000 * 1e6:7.1f}us  x{t_plain / t_frozen:.2f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compares sqlite IN strategies: a parameter per item, inlined literals and json_each
+
+Usage: PYTHONPATH=. python bench/sqlite_in.py
+"""
+
+import sqlite3
+import time
+from typing import Callable, List
+
+from sqlbind_t import SQL, E, sqlite
+
+
+def dialect(strategy: str, max_values: int) -> sqlite.Dialect:
+    d = sqlite.Dialect()
+    d.IN_STRATEGY = strategy
+    d.IN_MAX_VALUES = max_values
+    return d
+
+
+def run(conn: sqlite3.Connection, d: sqlite.Dialect, lists: List[List[int]]) -> float:
+    start = time.perf_counter()
+    for values in lists:
+        sql, params = d.render(SQL('SELECT count(*) FROM t WHERE ', *E.id.IN(values)))
+        conn.execute(sql, params).fetchone()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE t (id INTEGER PRIMARY KEY)')
+    conn.executemany('INSERT INTO t VALUES (?)', ((it,) for it in range(200000)))
+
+    strategies: List[Callable[[], sqlite.Dialect]] = [
+        lambda: dialect('inline', sqlite.Dialect.MAX_PARAMS),
+        lambda: dialect('inline', 0),
+        lambda: dialect('json', 0),
+    ]
+    names = ['params', 'inline', 'json']
+    for size, count in [(10, 2000), (1000, 200), (30000, 10), (100000, 3)]:
+        # lists of the same size with different values
+        lists = [list(range(i, i + size)) for i in range(count)]
+        row = []
+        for name, make in zip(names, strategies):
+            if name == 'params' and size > sqlite.Dialect.MAX_PARAMS:
+                row.append(f'{name}: {"n/a":>9}')
+                continue
+            elapsed = run(conn, make(), lists)
+            row.append(f'{name}: {elapsed / count * 1e3:7.3f}ms')
+        print(f'size {size:6}  ' + '  '.join(row))
+
+
+if __name__ == '__main__':
+    main()
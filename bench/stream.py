@@ -0,0 +1,45 @@
+"""Peak memory of rendering a large VALUES statement into a string and a file
+
+Usage: PYTHONPATH=. python bench/stream.py
+"""
+
+import os
+import tracemalloc
+from typing import Callable
+
+from sqlbind_t import SQL, VALUES
+from sqlbind_t.dialect import Dialect
+from sqlbind_t.template import Interpolation
+
+ROWS = 100000
+
+
+def peak(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    fn()
+    _, result = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result / 2**20
+
+
+def main() -> None:
+    dialect = Dialect()
+    data = [{'id': it, 'name': f'name{it}', 'value': it / 3} for it in range(ROWS)]
+    q = SQL('INSERT INTO t ', Interpolation(VALUES(data)))
+    sql, _ = dialect.render(q)
+    print(f'SQL size: {len(sql) / 2**20:.1f} MiB')
+    del sql
+
+    with open(os.devnull, 'w') as text, open(os.devnull, 'wb') as binary:
+        cases = [
+            ('render', lambda: dialect.render(q)),
+            ('render+encode', lambda: dialect.render(q)[0].encode()),
+            ('render_to text', lambda: dialect.render_to(q, text)),
+            ('render_to bytes', lambda: dialect.render_to(q, binary, encoding='utf-8')),
+        ]
+        for name, fn in cases:
+            print(f'{name:16} peak: {peak(fn):6.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 from typing import (
+    TYPE_CHECKING,
+    Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
@@ -7,11 +10,18 @@ from typing import (
     Tuple,
     TypeVar,
     Union,
+    cast,
+    overload,
 )
 
+from .arrays import array_columns, array_rows, as_list, check_array, is_array
 from .compat import Collection
-from .template import Interpolation, Template, parse_template
-from .tfstring import check_template
+from .query_params import ParamsT, QMarkQueryParams
+from .template import Interpolation, Template, check_template, parse_template
+
+if TYPE_CHECKING:
+    from .dialect import Dialect, Shape
+    from .plan import Plan
 
 version = '0.1'
 
@@ -22,15 +32,40 @@ SafeStr = Union['Expr', AnySQL]
 
 
 class UndefinedType:
-    pass
+    __slots__ = ()
 
 
 UNDEFINED = UndefinedType()
 
 
+class Slot:
+    """Placeholder for a plan argument, see `compile`"""
+
+    __slots__ = ('index', 'name', 'nullable', 'conditional')
+
+    def __init__(self, index: int, name: str) -> None:
+        self.index = index
+        self.name = name
+        #: Slot is compared with `=`, SQL text differs for None (`IS NULL`)
+        self.nullable = False
+        #: Slot is used in a condition (`not_none`, `truthy`, `cond`)
+        self.conditional = False
+
+    def __bool__(self) -> bool:
+        self.conditional = True
+        return True
+
+    def __repr__(self) -> str:
+        return f'Slot({self.name})'
+
+
 class SQL:
+    __slots__ = ('_parts', '_shape')
+
     def __init__(self, *parts: Part) -> None:
         self._parts = parts
+        #: Memoized `Dialect.shape`, see `Dialect._shape`
+        self._shape: Optional[Shape] = None
 
     def __iter__(self) -> Iterator[Part]:
         return iter(self._parts)
@@ -55,6 +90,14 @@ class SQL:
 
 
 class Compound(SQL):
+    """Fragments joined with a separator
+
+    Parts are built on first iteration and reused, so rendering a prebuilt
+    compound doesn't allocate wrappers for children.
+    """
+
+    __slots__ = ('_prefix', '_sep', '_wrap', '_tlist')
+
     def __init__(
         self,
         prefix: str,
@@ -66,8 +109,16 @@ class Compound(SQL):
         self._sep = sep
         self._wrap = wrap
         self._tlist = tlist
+        self._parts = ()
+        self._shape = None
 
     def __iter__(self) -> Iterator[Part]:
+        parts = self._parts
+        if not parts:
+            parts = self._parts = tuple(self._build())
+        return iter(parts)
+
+    def _build(self) -> Iterator[Part]:
         if self._prefix:
             yield self._prefix
 
@@ -105,6 +156,21 @@ def sql(template: AnySQL) -> SQL:
     return SQL(*template)
 
 
+def freeze(fragment: AnySQL) -> SQL:
+    """Marks a constant fragment to reuse its rendered SQL
+
+    Fragment is walked once into static chunks and values, placeholders
+    are assigned on each render, so positional styles are numbered
+    correctly. Fragment must not be changed after freezing.
+
+    >>> ACTIVE = freeze(sqlf(f'@deleted_at IS NULL AND tenant_id = {TENANT}'))
+    """
+    query = sql(fragment)
+    if not query:
+        return EMPTY
+    return SQL(Interpolation(FrozenOp(query)))
+
+
 def sqls(template: str) -> SQL:
     return sql(parse_template(template, level=2))
 
@@ -113,45 +179,124 @@ def sqlf(template: Union[AnySQL, str]) -> SQL:
     return sql(check_template(template))  # type: ignore[arg-type]
 
 
+@overload
+def compile(
+    builder: Callable[..., AnySQL], dialect: Optional['Dialect'] = None
+) -> 'Plan[QMarkQueryParams]': ...
+
+
+@overload
+def compile(
+    builder: Callable[..., AnySQL], dialect: Optional['Dialect'], params: Callable[[], ParamsT]
+) -> 'Plan[ParamsT]': ...
+
+
+def compile(
+    builder: Callable[..., AnySQL],
+    dialect: Optional['Dialect'] = None,
+    params: Optional[Callable[[], ParamsT]] = None,
+) -> 'Plan[ParamsT]':
+    """Precompiles a query builder into a reusable plan
+
+    Builder is called once with `Slot` placeholders for each positional
+    argument. Resulting SQL text is rendered once and `Plan.bind` only
+    collects parameters.
+
+    >>> plan = compile(lambda uid: sqlf(f'@SELECT * FROM users WHERE id = {uid}'))
+    >>> plan.bind(10)
+    ('SELECT * FROM users WHERE id = ?', [10])
+
+    Builders with conditional parts over arguments (`not_none`, `truthy`,
+    `cond`) are called on each bind, so parts are dropped the same way.
+    Comparisons like `E.x == arg` are rendered from the builder again
+    if `arg` is None to produce `x IS NULL`.
+    """
+    from .plan import Plan
+
+    return Plan(builder, dialect, params or QMarkQueryParams)  # type: ignore[arg-type]
+
+
 def AND(*fragments: AnySQL) -> SQL:
-    return join_fragments(' AND ', fragments, ('(', ')'))
+    return join_fragments(' AND ', fragments, ('(', ')'), flatten=True)
 
 
 def OR(*fragments: AnySQL) -> SQL:
-    return join_fragments(' OR ', fragments, ('(', ')'))
+    return join_fragments(' OR ', fragments, ('(', ')'), flatten=True)
+
+
+#: Compound wraps which only group children, see `join_fragments`
+GROUPING = (None, ('(', ')'))
 
 
 def join_fragments(
-    sep: str, flist: Sequence[AnySQL], wrap: Optional[Tuple[str, str]] = None, prefix: str = ''
+    sep: str,
+    flist: Sequence[AnySQL],
+    wrap: Optional[Tuple[str, str]] = None,
+    prefix: str = '',
+    flatten: bool = False,
 ) -> SQL:
-    flist = list(filter(None, flist))
-    if not flist:
+    """Joins non-empty fragments with a separator
+
+    With `flatten`, children compounds with the same separator are merged
+    into the result, so `a & b & c` is a single `(a AND b AND c)` instead
+    of nested `((a AND b) AND c)`. Use it only for associative operators.
+    Children with a custom `wrap` (not plain parentheses) are kept as is.
+    """
+    result: List[AnySQL] = []
+    for it in flist:
+        if not it:
+            continue
+        if (
+            flatten
+            and type(it) is Compound
+            and it._sep == sep
+            and not it._prefix
+            and it._wrap in GROUPING
+        ):
+            result.extend(it._tlist)
+        else:
+            result.append(it)
+
+    if not result:
         return EMPTY
-    elif len(flist) == 1:
-        return Compound(prefix, sep, flist)
+    elif len(result) == 1:
+        return Compound(prefix, sep, result)
 
-    return Compound(prefix, sep, flist, wrap)
+    return Compound(prefix, sep, result, wrap)
 
 
 def WHERE(*cond: AnySQL, **kwargs: object) -> SQL:
     flist = list(sql(it) for it in cond) + [
-        SQL(f'{field} IS NULL') if value is None else SQL(f'{field} = ', Interpolation(value))
+        eq(field, value, '=', 'IS NULL')
         for field, value in kwargs.items()
         if value is not UNDEFINED
     ]
-    return join_fragments(' AND ', flist, prefix='WHERE ')
+    return join_fragments(' AND ', flist, prefix='WHERE ', flatten=True)
 
 
-def VALUES(data: Optional[List[Dict[str, object]]] = None, **kwargs: object) -> SQL:
+def VALUES(
+    data: Optional[Union[List[Dict[str, object]], Collection[object]]] = None, **kwargs: object
+) -> SQL:
+    """Renders `(names) VALUES (...), ...` from a list of dicts or a structured array"""
+    rows: Iterable[Sequence[object]]
     if data is None:
         data = [kwargs]
 
-    names = list(data[0].keys())
+    if is_array(data):
+        names = array_columns(data)
+        if names is None:
+            raise ValueError('VALUES requires a list of dicts or a structured array')
+        rows = array_rows(data)
+    else:
+        dlist = cast(List[Dict[str, object]], data)
+        names = list(dlist[0].keys())
+        rows = ([it[f] for f in names] for it in dlist)
+
     result: List[Part] = [f'({", ".join(names)}) VALUES ']
-    for it in data:
+    for row in rows:
         result.append('(')
-        for f in names:
-            result.extend((Interpolation(it[f]), ', '))
+        for value in row:
+            result.extend((Interpolation(value), ', '))
         result.pop()
         result.append(')')
         result.append(', ')
@@ -174,13 +319,19 @@ def SET(**kwargs: object) -> SQL:
 
 
 class NotNone:
+    __slots__ = ()
+
     def __truediv__(self, other: Optional[T]) -> Union[T, UndefinedType]:
         if other is None:
             return UNDEFINED
+        elif isinstance(other, Slot):
+            other.conditional = True
         return other
 
 
 class Truthy:
+    __slots__ = ()
+
     def __truediv__(self, other: Optional[T]) -> Union[T, UndefinedType]:
         if not other:
             return UNDEFINED
@@ -188,6 +339,8 @@ class Truthy:
 
 
 class Condition:
+    __slots__ = ('_cond',)
+
     def __init__(self, cond: object) -> None:
         self._cond = bool(cond)
 
@@ -230,10 +383,28 @@ def op2(left: str, right: object) -> SQL:
     return SQL(left, Interpolation(right))
 
 
-def IN(field: SafeStr, value: Union[Collection[object], UndefinedType]) -> SQL:
+def eq(field: str, value: object, op: str, null: str) -> SQL:
+    if value is None:
+        return SQL(f'{field} {null}')
+    elif isinstance(value, Slot):
+        value.nullable = True
+    return op2(f'{field} {op} ', value)
+
+
+def IN(field: SafeStr, value: Union[Collection[object], UndefinedType], op: str = 'IN') -> SQL:
     if value is UNDEFINED:
         return EMPTY
-    return SQL(Interpolation(IN_Op(field, list(value))))  # type: ignore[arg-type]
+    if is_array(value):
+        check_array(value)
+        # snapshot, a caller could change a buffer before rendering
+        value = as_list(value)
+    elif not isinstance(value, Slot):
+        value = list(value)  # type: ignore[arg-type]
+    return SQL(Interpolation(IN_Op(field, value, op)))  # type: ignore[arg-type]
+
+
+def NOT_IN(field: SafeStr, value: Union[Collection[object], UndefinedType]) -> SQL:
+    return IN(field, value, 'NOT IN')
 
 
 def LIKE(field: SafeStr, template: str, value: Union[str, UndefinedType], op: str = 'LIKE') -> SQL:
@@ -269,18 +440,46 @@ SelfExpr = TypeVar('SelfExpr', bound='Expr')
 
 
 class Expr:
+    """Safe SQL identifier or expression, see `E`
+
+    Attribute chains are interned: children of an expression are cached,
+    so `E.users.id` returns the same object each time. Cache holds up to
+    CACHE_SIZE children per expression, see also `declare`.
+    """
+
+    __slots__ = ('_left', '_children')
+
+    #: Maximum number of cached children per expression
+    CACHE_SIZE = 256
+
     def __init__(self, left: str = '') -> None:
         self._left = left
+        self._children: Optional[Dict[str, Expr]] = None
 
     def __getattr__(self: SelfExpr, name: str) -> SelfExpr:
-        if self._left:
-            return self.__class__(f'{self._left}.{name}')
-        return self.__class__(name)
+        return self._child(name)
 
     def __call__(self: SelfExpr, name: str) -> SelfExpr:
+        return self._child(name)
+
+    def _child(self: SelfExpr, name: str) -> SelfExpr:
+        children = self._children
+        if children is None:
+            children = self._children = {}
+        else:
+            try:
+                return children[name]  # type: ignore[return-value]
+            except KeyError:
+                pass
+
         if self._left:
-            return self.__class__(f'{self._left}.{name}')
-        return self.__class__(name)
+            result = self.__class__(f'{self._left}.{name}')
+        else:
+            result = self.__class__(name)
+
+        if len(children) < self.CACHE_SIZE:
+            children[name] = result
+        return result
 
     def __lt__(self, right: object) -> SQL:
         return op2(f'{self._left} < ', right)
@@ -295,14 +494,10 @@ class Expr:
         return op2(f'{self._left} >= ', right)
 
     def __eq__(self, right: object) -> SQL:  # type: ignore[override]
-        if right is None:
-            return SQL(f'{self._left} IS NULL')
-        return op2(f'{self._left} = ', right)
+        return eq(self._left, right, '=', 'IS NULL')
 
     def __ne__(self, right: object) -> SQL:  # type: ignore[override]
-        if right is None:
-            return SQL(f'{self._left} IS NOT NULL')
-        return op2(f'{self._left} != ', right)
+        return eq(self._left, right, '!=', 'IS NOT NULL')
 
     def __invert__(self) -> SQL:
         return SQL('NOT ' + self._left)
@@ -310,6 +505,9 @@ class Expr:
     def IN(self, right: Union[Collection[object], UndefinedType]) -> SQL:
         return IN(self, right)
 
+    def NOT_IN(self, right: Union[Collection[object], UndefinedType]) -> SQL:
+        return NOT_IN(self, right)
+
     def LIKE(self, template: str, right: Union[str, UndefinedType]) -> SQL:
         return LIKE(self, template, right)
 
@@ -319,4 +517,21 @@ class Expr:
 
 E = Expr()
 
-from .dialect import IN_Op, LIKE_Op
+
+def declare(expr: SelfExpr, *names: str) -> SelfExpr:
+    """Precomputes children of an expression regardless of CACHE_SIZE
+
+    >>> users = declare(E.users, 'id', 'name')
+    >>> users.id is E.users.id
+    True
+    """
+    children = expr._children
+    if children is None:
+        children = expr._children = {}
+    for it in names:
+        if it not in children:
+            children[it] = expr.__class__(f'{expr._left}.{it}' if expr._left else it)
+    return expr
+
+
+from .dialect import FrozenOp, IN_Op, LIKE_Op
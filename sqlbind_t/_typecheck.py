@@ -1,6 +1,6 @@
 from typing_extensions import assert_type
 
-from . import SQL, WHERE, Expr
+from . import SQL, WHERE, Expr, compile
 from .dialect import render
 from .query_params import NumericQueryParams, QMarkQueryParams
 
@@ -25,3 +25,8 @@ def test_expr_extension_should_keep_original_type() -> None:
 
     val = MyExpr().val
     assert_type(val, MyExpr)
+
+
+def test_return_type_for_compiled_plan() -> None:
+    assert_type(compile(lambda: SQL()).bind()[1], QMarkQueryParams)
+    assert_type(compile(lambda: SQL(), None, NumericQueryParams).bind()[1], NumericQueryParams)
@@ -0,0 +1,93 @@
+"""NumPy arrays, `array.array` and memoryview support
+
+NumPy is not imported, arrays are detected by `dtype` and `tolist`
+attributes. Values are converted with `tolist()` which produces native
+Python objects, iterating over NumPy arrays produces NumPy scalars
+unsupported by most drivers. Scalar kinds let literals skip per value
+type checks, values of other kinds (objects, dates) are checked one by one.
+"""
+
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+#: Kinds of array.array typecodes and memoryview formats in NumPy terms
+TYPECODE_KINDS = {
+    'b': 'i',
+    'h': 'i',
+    'i': 'i',
+    'l': 'i',
+    'q': 'i',
+    'n': 'i',
+    'B': 'u',
+    'H': 'u',
+    'I': 'u',
+    'L': 'u',
+    'Q': 'u',
+    'N': 'u',
+    'f': 'f',
+    'd': 'f',
+    'e': 'f',
+    '?': 'b',
+    'u': 'U',
+    'w': 'U',
+    'c': 'S',
+}
+
+
+def is_array(value: object) -> bool:
+    if isinstance(value, (array, memoryview)):
+        return True
+    return hasattr(value, 'dtype') and hasattr(value, 'tolist')
+
+
+def array_kind(value: Any) -> str:
+    """Returns NumPy dtype kind of an array"""
+    if isinstance(value, array):
+        return TYPECODE_KINDS.get(value.typecode, 'O')
+    elif isinstance(value, memoryview):
+        return TYPECODE_KINDS.get(value.format.lstrip('@=<>!'), 'V')
+    return value.dtype.kind  # type: ignore[no-any-return]
+
+
+def array_columns(value: Any) -> Optional[List[str]]:
+    """Returns field names of a structured array"""
+    names = getattr(getattr(value, 'dtype', None), 'names', None)
+    return list(names) if names else None
+
+
+def check_array(value: Any) -> None:
+    """Checks an array could be used as a list of values"""
+    if getattr(value, 'ndim', 1) != 1:
+        raise ValueError('Array must be one-dimensional')
+
+
+def as_list(value: Any) -> List[Any]:
+    """Returns values of an array or any other collection as a list
+
+    Lists are returned as is.
+    """
+    if type(value) is list:
+        return value
+    elif is_array(value):
+        return value.tolist()  # type: ignore[no-any-return]
+    return list(value)
+
+
+def scalars(value: Any) -> Iterable[Any]:
+    """Returns Python scalars of an array without a copy if possible"""
+    if isinstance(value, (array, memoryview)):
+        return value
+    return value.tolist()  # type: ignore[no-any-return]
+
+
+def array_rows(value: Any) -> Iterator[Sequence[Any]]:
+    """Yields rows of a 2-D or structured array one by one"""
+    if array_columns(value) is None:
+        if getattr(value, 'ndim', 1) != 2:
+            raise ValueError('Array rows must be two-dimensional or structured')
+        if isinstance(value, memoryview):
+            # memoryview doesn't support sub-views
+            yield from value.tolist()  # type: ignore[misc]
+            return
+    for it in value:
+        yield it.tolist()
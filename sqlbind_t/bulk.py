@@ -0,0 +1,206 @@
+from functools import partial
+from itertools import chain, islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from . import SQL, VALUES
+from .arrays import array_columns, array_rows, is_array
+from .dialect import Dialect
+from .plan import Plan
+from .query_params import ParamsT, QMarkQueryParams
+
+Row = Union[Mapping[str, object], Sequence[object]]
+RowGetter = Callable[[Row], Sequence[object]]
+
+
+def _row_getter(first: Row, columns: Sequence[str]) -> RowGetter:
+    if isinstance(first, Mapping):
+        return lambda row: [row[it] for it in columns]  # type: ignore[call-overload]
+
+    ncols = len(columns)
+
+    def getter(row: Row) -> Sequence[object]:
+        # chunks are flattened, a short row would shift following values
+        if len(row) != ncols:
+            raise ValueError(f'Row has {len(row)} values, expected {ncols}: {row!r}')
+        return row  # type: ignore[return-value]
+
+    return getter
+
+
+def _columns(first: Optional[Row], columns: Optional[Sequence[str]]) -> Sequence[str]:
+    if columns is not None:
+        return columns
+    if isinstance(first, Mapping):
+        return list(first)
+    raise ValueError('columns are required for empty or non-mapping rows')
+
+
+def _array_rows(
+    rows: Iterable[Row], columns: Optional[Sequence[str]]
+) -> Tuple[Iterable[Row], Optional[Sequence[str]]]:
+    # 2-D and structured arrays are consumed row by row
+    if is_array(rows):
+        return array_rows(rows), columns or array_columns(rows)
+    return rows, columns
+
+
+def _no_dedup(params: Callable[[], ParamsT]) -> ParamsT:
+    # a row binds each value once, dedup would only make SQL text vary
+    result = params()
+    result.dedup = None
+    return result
+
+
+def _insert(table: str, columns: Sequence[str], size: int) -> Callable[..., SQL]:
+    def builder(*args: object) -> SQL:
+        it = iter(args)
+        data = [{c: next(it) for c in columns} for _ in range(size)]
+        return SQL(f'INSERT INTO {table} ', *VALUES(data))
+
+    return builder
+
+
+@overload
+def insert_many(
+    table: str,
+    rows: Iterable[Row],
+    columns: Optional[Sequence[str]] = None,
+    *,
+    dialect: Optional[Dialect] = None,
+) -> Tuple[str, Iterator[QMarkQueryParams]]: ...
+
+
+@overload
+def insert_many(
+    table: str,
+    rows: Iterable[Row],
+    columns: Optional[Sequence[str]] = None,
+    *,
+    dialect: Optional[Dialect] = None,
+    params: Callable[[], ParamsT],
+) -> Tuple[str, Iterator[ParamsT]]: ...
+
+
+def insert_many(
+    table: str,
+    rows: Iterable[Row],
+    columns: Optional[Sequence[str]] = None,
+    *,
+    dialect: Optional[Dialect] = None,
+    params: Optional[Callable[[], ParamsT]] = None,
+) -> Tuple[str, Iterator[ParamsT]]:
+    """Renders single row INSERT and parameters of each row for executemany
+
+    Rows are mappings or sequences in `columns` order, they are consumed
+    lazily. Columns are taken from the first mapping row if not set.
+    2-D and structured arrays are supported, structured arrays provide
+    columns from dtype field names.
+
+    >>> sql, params = insert_many('users', [{'id': 1, 'name': 'boo'}])
+    >>> sql
+    'INSERT INTO users (id, name) VALUES (?, ?)'
+    >>> cursor.executemany(sql, params)
+    """
+    rows, columns = _array_rows(rows, columns)
+    it = iter(rows)
+    first: Optional[Row] = next(it, None)
+    columns = _columns(first, columns)
+    plan: Plan[ParamsT] = Plan(
+        _insert(table, columns, 1),
+        dialect,
+        partial(_no_dedup, params or QMarkQueryParams),  # type: ignore[arg-type]
+        columns,
+    )
+    assert plan.sql is not None
+
+    if first is None:
+        return plan.sql, iter(())
+
+    getter = _row_getter(first, columns)
+    bind = plan.bind_params
+    return plan.sql, (bind(*getter(row)) for row in chain((first,), it))
+
+
+@overload
+def insert_chunks(
+    table: str,
+    rows: Iterable[Row],
+    columns: Optional[Sequence[str]] = None,
+    *,
+    dialect: Optional[Dialect] = None,
+    max_params: Optional[int] = None,
+) -> Iterator[Tuple[str, QMarkQueryParams]]: ...
+
+
+@overload
+def insert_chunks(
+    table: str,
+    rows: Iterable[Row],
+    columns: Optional[Sequence[str]] = None,
+    *,
+    dialect: Optional[Dialect] = None,
+    params: Callable[[], ParamsT],
+    max_params: Optional[int] = None,
+) -> Iterator[Tuple[str, ParamsT]]: ...
+
+
+def insert_chunks(
+    table: str,
+    rows: Iterable[Row],
+    columns: Optional[Sequence[str]] = None,
+    *,
+    dialect: Optional[Dialect] = None,
+    params: Optional[Callable[[], ParamsT]] = None,
+    max_params: Optional[int] = None,
+) -> Iterator[Tuple[str, ParamsT]]:
+    """Yields multi-row INSERT statements with parameters for chunks of rows
+
+    Chunks are sized to fit `max_params` (dialect's MAX_PARAMS by default)
+    bound parameters. All full chunks share the same SQL text, so driver
+    statement caches are reused. Rows are consumed lazily.
+
+    >>> for sql, params in insert_chunks('users', rows):
+    ...     cursor.execute(sql, params)
+    """
+    dialect = dialect or Dialect()
+    rows, columns = _array_rows(rows, columns)
+    it = iter(rows)
+    first: Optional[Row] = next(it, None)
+    columns = _columns(first, columns)
+    if first is None:
+        return
+
+    size = (max_params or dialect.MAX_PARAMS) // len(columns)
+    if not size:
+        raise ValueError(f'{len(columns)} columns exceed parameter limit')
+
+    plans: Dict[int, Plan[ParamsT]] = {}
+    getter = _row_getter(first, columns)
+    it = chain((first,), it)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            break
+
+        plan = plans.get(len(chunk))
+        if plan is None:
+            plan = plans[len(chunk)] = Plan(
+                _insert(table, columns, len(chunk)),
+                dialect,
+                partial(_no_dedup, params or QMarkQueryParams),  # type: ignore[arg-type]
+                [f'{c}_{i}' for i in range(len(chunk)) for c in columns],
+            )
+
+        values = [v for row in chunk for v in getter(row)]
+        yield plan.bind(*values)
@@ -1,14 +1,60 @@
-from typing import Generic, Iterator, Optional, Tuple, TypeVar, Union, overload
+from bisect import bisect_left
+from contextlib import contextmanager
+from itertools import islice
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
-from . import SQL, AnySQL, Expr, SafeStr
+from . import EMPTY, SQL, AnySQL, Expr, SafeStr
+from .arrays import as_list
 from .compat import Collection
-from .query_params import ParamsT, QMarkQueryParams, QueryParams
-from .template import Interpolation, Template
+from .literals import Literals
+from .query_params import ListQueryParams, ParamsT, QMarkQueryParams, QueryParams
+from .template import Template
+
+if TYPE_CHECKING:
+    from .plan import Plan
+    from .profile import Profiler
 
 T = TypeVar('T')
 
 
+class Marker:
+    """Position of a bound value or a DialectOp in a query structure"""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+#: Slot markers of query structures, see `Dialect.shape`
+VALUE = Marker('VALUE')
+OP = Marker('OP')
+
+Structure = Tuple[Union[str, Marker], ...]
+Shape = Tuple[Structure, List[object]]
+
+
 class DialectOp(Generic[T]):
+    __slots__ = ('field', 'value')
     method: str
 
     def __init__(self, field: SafeStr, value: T):
@@ -20,35 +66,155 @@ class DialectOp(Generic[T]):
 
 
 class IN_Op(DialectOp[Union[Collection[object]]]):
+    __slots__ = ('op',)
     method = 'IN'
 
+    def __init__(self, field: SafeStr, value: Collection[object], op: str = 'IN'):
+        DialectOp.__init__(self, field, value)
+        self.op = op
+
 
 class LIKE_Op(DialectOp[str]):
+    __slots__ = ('op', 'template')
     method = 'LIKE'
     op: str
     template: str
 
 
+class SeekOp(DialectOp[Sequence[object]]):
+    """Keyset pagination predicate, see `sqlbind_t.keyset.Keyset`"""
+
+    __slots__ = ('columns', 'desc')
+    method = 'SEEK'
+
+    def __init__(self, columns: Sequence[Expr], values: Sequence[object], desc: Sequence[bool]):
+        DialectOp.__init__(self, EMPTY, values)
+        self.columns = columns
+        self.desc = desc
+
+
+class FrozenOp(DialectOp[SQL]):
+    """Constant fragment with cached static chunks and values, see `freeze`
+
+    Shape doesn't depend on a dialect, so a single one is kept.
+    """
+
+    __slots__ = ('shape',)
+    method = 'frozen'
+
+    def __init__(self, query: SQL):
+        DialectOp.__init__(self, EMPTY, query)
+        self.shape: Optional[Tuple[List[str], List[object]]] = None
+
+
+class StreamBuffer(List[str]):
+    """Output of `Dialect._write` flushing parts into a writer
+
+    Parts are accumulated until `size` characters and written as a single
+    string or bytes if `encoding` is set.
+    """
+
+    def __init__(self, writer: IO[Any], size: int, encoding: Optional[str] = None) -> None:
+        list.__init__(self)
+        self.writer = writer
+        self.size = size
+        self.encoding = encoding
+        self._pending = 0
+
+    def append(self, part: str) -> None:
+        list.append(self, part)
+        self._pending += len(part)
+        if self._pending >= self.size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self:
+            data = ''.join(self)
+            self.clear()
+            self._pending = 0
+            self.writer.write(data.encode(self.encoding) if self.encoding else data)
+
+
 class Dialect:
     FALSE = 'FALSE'
+    TRUE = 'TRUE'
     LIKE_ESCAPE = '\\'
     LIKE_CHARS = '%_'
+    #: Maximum number of bound parameters in a statement
+    MAX_PARAMS = 65535
+    #: Rounds up a number of placeholders for IN lists rendered with
+    #: a parameter per value, so a few statement texts cover all list
+    #: sizes. Lists are padded with the last value. `None` disables
+    #: padding, `'pow2'` uses powers of two, or a sorted sequence of sizes.
+    IN_BUCKETS: Union[None, str, Sequence[int]] = None
+    #: Renders inline literals, see `literal`
+    LITERALS = Literals()
+    #: Row value comparisons, `(a, b) > (?, ?)`, are supported
+    ROW_VALUES = False
+    #: Collects render statistics if set, see `profile`
+    profiler: Optional['Profiler'] = None
 
     def IN(self, op: IN_Op, params: QueryParams) -> str:
-        if op.value:
+        if len(op.value):
             f = self.safe_str(op.field, params)
-            return f'{f} IN {params.compile(op.value)}'
-        return self.FALSE
+            return f'{f} {op.op} {params.compile(as_list(op.value))}'
+        return self.TRUE if op.op == 'NOT IN' else self.FALSE
+
+    def literal(self, value: object) -> str:
+        """Renders a value as an inline SQL literal
+
+        Use with care: values are escaped according to the dialect but
+        statement text depends on them, bound parameters are preferable.
+        """
+        return self.LITERALS.literal(value)
+
+    def in_bucket(self, size: int) -> int:
+        """Returns padded size of IN list, see IN_BUCKETS"""
+        buckets = self.IN_BUCKETS
+        if buckets is None:
+            return size
+        elif buckets == 'pow2':
+            return 1 << (size - 1).bit_length()
+        elif isinstance(buckets, str):
+            raise ValueError(f'Unknown IN buckets: {buckets}')
+
+        idx = bisect_left(buckets, size)
+        return buckets[idx] if idx < len(buckets) else size
 
     def LIKE(self, op: LIKE_Op, params: QueryParams) -> str:
         f = self.safe_str(op.field, params)
         value = like_escape(op.value, self.LIKE_ESCAPE, self.LIKE_CHARS)
         return f'{f} {op.op} {params.compile(op.template.format(value))}'
 
+    def SEEK(self, op: SeekOp, params: QueryParams) -> str:
+        columns = [it._left for it in op.columns]
+        values = op.value
+        compile = params.compile
+        if self.ROW_VALUES and len(columns) > 1 and len(set(op.desc)) == 1:
+            marks = ', '.join([compile(it) for it in values])
+            return f'({", ".join(columns)}) {"<" if op.desc[0] else ">"} ({marks})'
+
+        # (a > ? OR (a = ? AND b > ?) OR ...)
+        terms = []
+        for i, desc in enumerate(op.desc):
+            conds = [f'{columns[j]} = {compile(values[j])}' for j in range(i)]
+            conds.append(f'{columns[i]} {"<" if desc else ">"} {compile(values[i])}')
+            terms.append(conds[0] if i == 0 else f'({" AND ".join(conds)})')
+        return terms[0] if len(terms) == 1 else f'({" OR ".join(terms)})'
+
+    def frozen(self, op: FrozenOp, params: QueryParams) -> str:
+        shape = op.shape
+        if shape is None:
+            structure, values = self.shape(op.value)
+            shape = op.shape = (split_shape(structure), values)
+        return fill_shape(shape[0], shape[1], params, self)
+
     def safe_str(self, value: SafeStr, params: QueryParams) -> str:
         if isinstance(value, Expr):
             return value._left
-        return ''.join(self._walk(value, params))
+        out: List[str] = []
+        self._write(value, params, out)
+        return ''.join(out)
 
     @overload
     def render(self, query: AnySQL) -> Tuple[str, QMarkQueryParams]: ...
@@ -62,22 +228,291 @@ class Dialect:
             lparams = QMarkQueryParams()  # type: ignore[assignment]
         else:
             lparams = params
-        return ''.join(self._walk(query, lparams)), lparams
 
-    def _walk(self, query: AnySQL, params: QueryParams) -> Iterator[str]:
-        for it in query:
-            if type(it) is str:
-                yield it
+        if self.profiler is not None:
+            out: List[str] = []
+            self.profiler.run(self, query, lparams, out)
+            return ''.join(out), lparams
+
+        out = []
+        self._write(query, lparams, out)
+        return ''.join(out), lparams
+
+    @overload
+    def render_to(
+        self,
+        query: AnySQL,
+        writer: IO[Any],
+        *,
+        encoding: Optional[str] = None,
+        buffer_size: int = ...,
+    ) -> QMarkQueryParams: ...
+
+    @overload
+    def render_to(
+        self,
+        query: AnySQL,
+        writer: IO[Any],
+        params: ParamsT,
+        *,
+        encoding: Optional[str] = None,
+        buffer_size: int = ...,
+    ) -> ParamsT: ...
+
+    def render_to(
+        self,
+        query: AnySQL,
+        writer: IO[Any],
+        params: Optional[ParamsT] = None,
+        *,
+        encoding: Optional[str] = None,
+        buffer_size: int = 65536,
+    ) -> ParamsT:
+        """Renders query into a writer and returns params
+
+        SQL is written incrementally in pieces of about `buffer_size`
+        characters, so memory doesn't depend on a statement size. With
+        `encoding` pieces are written as bytes.
+
+        >>> buf = io.StringIO()
+        >>> params = dialect.render_to(query, buf)
+        """
+        lparams: ParamsT = QMarkQueryParams() if params is None else params  # type: ignore[assignment]
+        out = StreamBuffer(writer, buffer_size, encoding)
+        if self.profiler is not None:
+            self.profiler.run(self, query, lparams, out)
+        else:
+            self._write(query, lparams, out)
+        out.flush()
+        return lparams
+
+    @contextmanager
+    def profile(
+        self, callback: Optional[Callable[[Dict[str, Any]], None]] = None, *, maxsize: int = 1000
+    ) -> Iterator['Profiler']:
+        """Collects statistics of `render` and `render_to` calls
+
+        >>> with dialect.profile() as profiler:
+        ...     handle_request()
+        >>> profiler.snapshot()
+        {'SELECT * FROM users WHERE id = ?': {'count': 1, 'time': 2.1e-05, ...}}
+
+        Profiler is set on the dialect, so renders in all threads are
+        recorded. Without profiling the only overhead is an attribute check.
+        """
+        from .profile import Profiler
+
+        prev = self.profiler
+        self.profiler = profiler = Profiler(callback, maxsize=maxsize)
+        try:
+            yield profiler
+        finally:
+            self.profiler = prev
+
+    def render_tuple(
+        self, query: AnySQL, params: Optional[ListQueryParams] = None
+    ) -> Tuple[str, Tuple[object, ...]]:
+        """Renders query with parameters as a tuple, preferred by most drivers"""
+        sql, lparams = self.render(query, QMarkQueryParams() if params is None else params)
+        return sql, tuple(lparams)
+
+    @overload
+    def render_many(
+        self, builder: Callable[..., AnySQL], rows: Iterable[Sequence[object]]
+    ) -> List[Tuple[str, List[QMarkQueryParams]]]: ...
+
+    @overload
+    def render_many(
+        self,
+        builder: Callable[..., AnySQL],
+        rows: Iterable[Sequence[object]],
+        params: Callable[[], ParamsT],
+    ) -> List[Tuple[str, List[ParamsT]]]: ...
+
+    @overload
+    def render_many(
+        self, builder: 'Plan[ParamsT]', rows: Iterable[Sequence[object]]
+    ) -> List[Tuple[str, List[ParamsT]]]: ...
+
+    def render_many(
+        self,
+        builder: Union[Callable[..., AnySQL], 'Plan[Any]'],
+        rows: Iterable[Sequence[object]],
+        params: Optional[Callable[[], ParamsT]] = None,
+    ) -> List[Tuple[str, List[ParamsT]]]:
+        """Renders `builder(*row)` for each row grouped by resulting SQL
+
+        Each group is `(sql, [params, ...])` ready for `executemany`. Rows
+        of the same shape (same dropped UNDEFINED parts, IN list sizes and
+        so on) share SQL text, which is joined once per group.
+
+        A precompiled `Plan` (see `sqlbind_t.compile`) skips building and
+        walking a query for each row and only binds values with plan params.
+
+        >>> dialect.render_many(lambda uid: E.id == uid, [(1,), (2,)])
+        [('id = ?', [[1], [2]])]
+        """
+        from .plan import Plan
+
+        batches: Dict[object, Tuple[str, List[ParamsT]]] = {}
+        if isinstance(builder, Plan):
+            for row in rows:
+                sql, lparams = builder.bind(*row)
+                batch = batches.get(sql)
+                if batch is None:
+                    batches[sql] = (sql, [lparams])
+                else:
+                    batch[1].append(lparams)
+            return list(batches.values())
+
+        factory: Callable[[], ParamsT] = params or QMarkQueryParams  # type: ignore[assignment]
+        for row in rows:
+            structure, values = self.shape(builder(*row))
+            lparams = factory()
+            if lparams.dedup or OP in structure:
+                # placeholders or op output depend on values
+                sql = fill_shape(split_shape(structure), values, lparams, self)
+                key: object = sql
+            else:
+                batch = batches.get(structure)
+                if batch is not None:
+                    lparams.extend_values(values)
+                    batch[1].append(lparams)
+                    continue
+                sql = fill_shape(split_shape(structure), values, lparams, self)
+                key = structure
+
+            batch = batches.get(key)
+            if batch is None:
+                batches[key] = (sql, [lparams])
             else:
-                value: Interpolation = it.value  # type: ignore[union-attr,assignment]
+                batch[1].append(lparams)
+        return list(batches.values())
+
+    def _shape(self, query: AnySQL) -> Shape:
+        if not isinstance(query, SQL):
+            return self.shape(query)
+        shape = query._shape
+        if shape is None:
+            # queries are immutable, repeated renders skip the walk
+            shape = query._shape = self.shape(query)
+        return shape
+
+    def shape(self, query: AnySQL) -> Shape:
+        """Returns static structure of a query and its slot values
+
+        Structure is a tuple of literal SQL parts and Expr names with VALUE
+        and OP markers in place of bound values and dialect ops, values and
+        ops are collected in the same order. Nothing is rendered, so
+        structure depends only on query shape and could be used as a cache
+        key, see `split_shape` and `fill_shape`.
+        """
+        structure: List[Union[str, Marker]] = []
+        values: List[object] = []
+        add = structure.append
+        add_value = values.append
+        stack: List[Iterator[object]] = []
+        parts: Iterator[object] = iter(query)
+        while True:
+            for it in parts:
+                if type(it) is str:
+                    add(it)
+                    continue
+
+                value = it.value  # type: ignore[attr-defined]
                 if isinstance(value, (Template, SQL)):
-                    yield from self._walk(value, params)
+                    stack.append(parts)
+                    parts = iter(value)
+                    break
                 elif isinstance(value, DialectOp):
-                    yield value.render(params, self)
+                    add(OP)
+                    add_value(value)
                 elif isinstance(value, Expr):
-                    yield value._left
+                    add(value._left)
                 else:
-                    yield params.compile(value)
+                    add(VALUE)
+                    add_value(value)
+            else:
+                if not stack:
+                    return tuple(structure), values
+                parts = stack.pop()
+
+    def _write(
+        self,
+        query: AnySQL,
+        params: QueryParams,
+        out: List[str],
+        write_op: Optional[Callable[[DialectOp[Any], QueryParams, List[str]], None]] = None,
+    ) -> None:
+        """Renders query parts into `out`
+
+        Nested fragments are traversed with an explicit stack of iterators
+        instead of recursion, so depth isn't limited. Dialect ops are
+        passed to `write_op` (`Dialect.write_op` by default).
+        """
+        write_op = write_op or self.write_op
+        append = out.append
+        compile = params.compile
+        stack: List[Iterator[object]] = []
+        parts: Iterator[object] = iter(query)
+        while True:
+            for it in parts:
+                if type(it) is str:
+                    append(it)
+                    continue
+
+                value = it.value  # type: ignore[attr-defined]
+                if isinstance(value, (Template, SQL)):
+                    stack.append(parts)
+                    parts = iter(value)
+                    break
+                elif isinstance(value, DialectOp):
+                    write_op(value, params, out)
+                elif isinstance(value, Expr):
+                    append(value._left)
+                else:
+                    append(compile(value))
+            else:
+                if not stack:
+                    return
+                parts = stack.pop()
+
+    def write_op(self, op: DialectOp[Any], params: QueryParams, out: List[str]) -> None:
+        """Renders a dialect op into `out`
+
+        Ops with large output could be appended in pieces, so `render_to`
+        doesn't hold it as a single string.
+        """
+        out.append(op.render(params, self))
+
+
+def split_shape(structure: Structure) -> List[str]:
+    """Returns static SQL chunks surrounding slots of a structure"""
+    chunks: List[str] = []
+    current: List[str] = []
+    for it in structure:
+        if isinstance(it, Marker):
+            chunks.append(''.join(current))
+            current = []
+        else:
+            current.append(it)
+    chunks.append(''.join(current))
+    return chunks
+
+
+def fill_shape(
+    chunks: Sequence[str], values: Sequence[object], params: QueryParams, dialect: 'Dialect'
+) -> str:
+    """Renders SQL from shape chunks, binds values and renders ops"""
+    result = [chunks[0]]
+    compile = params.compile
+    for value, chunk in zip(values, islice(chunks, 1, None)):
+        if isinstance(value, DialectOp):
+            result.append(value.render(params, dialect))
+        else:
+            result.append(compile(value))
+        result.append(chunk)
+    return ''.join(result)
 
 
 def like_escape(value: str, escape: str = '\\', likechars: str = '%_') -> str:
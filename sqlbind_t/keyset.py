@@ -0,0 +1,207 @@
+"""Keyset (seek) pagination
+
+Pages are selected with a predicate over ordering columns instead of
+OFFSET, so a page costs the same at any depth given an index on the
+columns.
+
+>>> users = Keyset(E.created_at, E.id, limit=100)
+>>> def query(after: SQL) -> SQL:
+...     return sqlf(f'@SELECT * FROM users {WHERE(E.active == 1, after)} {users.order_limit}')
+>>> rows = conn.execute(*render(query(users.after(request_cursor)))).fetchall()
+>>> next_cursor = users.next_cursor(rows)
+
+Ordering columns must be non-NULL and unique together, usually a primary
+key is the last one.
+"""
+
+import base64
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Union
+from uuid import UUID
+
+from . import EMPTY, SQL, AnySQL, Expr
+from .dialect import Dialect, SeekOp
+from .query_params import QMarkQueryParams, QueryParams
+from .template import Interpolation
+
+KeyGetter = Callable[[Any], Sequence[object]]
+
+
+class Keyset:
+    """Keyset pagination over ordering columns
+
+    `desc` is a direction of all columns or of each one. Key values are
+    taken from rows by column names (the last part of `E.users.id` is
+    `id`), rows must support `row[name]`. Use `key` for tuple rows.
+    """
+
+    def __init__(
+        self,
+        *columns: Expr,
+        limit: int,
+        desc: Union[bool, Sequence[bool]] = False,
+        key: Optional[KeyGetter] = None,
+    ) -> None:
+        if not columns:
+            raise ValueError('Ordering columns are required')
+        self.columns = columns
+        self.desc = [desc] * len(columns) if isinstance(desc, bool) else list(desc)
+        if len(self.desc) != len(columns):
+            raise ValueError('desc must be set for each column')
+
+        self.limit = int(limit)
+        self.key = key
+        self.names = [it._left.rsplit('.', 1)[-1] for it in columns]
+
+        order = ', '.join(f'{c._left} DESC' if d else c._left for c, d in zip(columns, self.desc))
+        #: `ORDER BY ... LIMIT n` fragment to end a page query
+        self.order_limit = SQL(f'ORDER BY {order} LIMIT {self.limit}')
+
+    def seek(self, values: Sequence[object]) -> SQL:
+        """Returns predicate selecting rows after key values"""
+        return SQL(Interpolation(SeekOp(self.columns, list(values), self.desc)))
+
+    def after(self, cursor: Optional[str]) -> SQL:
+        """Returns predicate selecting rows after a cursor, EMPTY for None"""
+        if cursor is None:
+            return EMPTY
+        values = decode_cursor(cursor)
+        if len(values) != len(self.columns):
+            raise ValueError('Invalid cursor')
+        return self.seek(values)
+
+    def key_values(self, row: Any) -> Sequence[object]:
+        if self.key is not None:
+            return self.key(row)
+        if isinstance(row, (tuple, list)):
+            raise ValueError('key is required for tuple rows')
+        return [row[it] for it in self.names]
+
+    def cursor(self, row: Any) -> str:
+        """Returns opaque cursor pointing after a row"""
+        return encode_cursor(self.key_values(row))
+
+    def next_cursor(self, rows: Sequence[Any]) -> Optional[str]:
+        """Returns cursor of a next page or None for the last page"""
+        if len(rows) < self.limit:
+            return None
+        return self.cursor(rows[-1])
+
+
+def scan(
+    conn: Any,
+    keyset: Keyset,
+    query: Callable[[SQL], AnySQL],
+    *,
+    dialect: Optional[Dialect] = None,
+    params: Callable[[], QueryParams] = QMarkQueryParams,
+) -> Iterator[Any]:
+    """Yields all rows of a query fetching them page by page
+
+    `query` is called with a seek predicate, EMPTY for the first page, and
+    must end with `keyset.order_limit`. Only a page of rows is kept in
+    memory. Tuple rows without `keyset.key` are read by positions of
+    ordering columns in `cursor.description`.
+    """
+    dialect = dialect or Dialect()
+    cursor = conn.cursor()
+    try:
+        predicate = EMPTY
+        key = keyset.key
+        while True:
+            sql, values = dialect.render(query(predicate), params())
+            cursor.execute(sql, values)
+            rows = cursor.fetchall()
+            yield from rows
+            if len(rows) < keyset.limit:
+                return
+
+            if key is None:
+                key = _description_key(keyset, cursor.description)
+            predicate = keyset.seek(key(rows[-1]))
+    finally:
+        cursor.close()
+
+
+def _description_key(keyset: Keyset, description: Sequence[Sequence[Any]]) -> KeyGetter:
+    names = [it[0] for it in description]
+    try:
+        indexes = [names.index(it) for it in keyset.names]
+    except ValueError:
+        raise ValueError(f'Result must include ordering columns: {keyset.names}') from None
+    return lambda row: [row[it] for it in indexes]
+
+
+def encode_cursor(values: Sequence[object]) -> str:
+    """Encodes key values into an url-safe string
+
+    Cursors are not signed, decoded values are only bound as parameters.
+    """
+    data = json.dumps([_dump(it) for it in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[object]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+        if not isinstance(data, list):
+            raise ValueError('Cursor must be a list')
+        return [_load(it) for it in data]
+    except (ValueError, TypeError, KeyError, AttributeError, ArithmeticError, RecursionError):
+        raise ValueError('Invalid cursor') from None
+
+
+def _dump(value: object) -> object:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, datetime):
+        offset = value.utcoffset()
+        return {
+            't': 'datetime',
+            'v': list(value.timetuple()[:6]) + [value.microsecond],
+            'tz': None if offset is None else offset.total_seconds(),
+        }
+    elif isinstance(value, date):
+        return {'t': 'date', 'v': value.toordinal()}
+    elif isinstance(value, time):
+        return {'t': 'time', 'v': [value.hour, value.minute, value.second, value.microsecond]}
+    elif isinstance(value, (Decimal, UUID)):
+        return {'t': type(value).__name__, 'v': str(value)}
+    elif isinstance(value, bytes):
+        return {'t': 'bytes', 'v': value.hex()}
+    raise ValueError(f'Invalid type: {value!r}')
+
+
+def _load(value: Any) -> object:
+    if not isinstance(value, dict):
+        if isinstance(value, list):
+            raise ValueError('Invalid cursor value')
+        return value
+
+    tag, data = value['t'], value['v']
+    if tag in ('datetime', 'time'):
+        if not isinstance(data, list) or not all(type(it) is int for it in data):
+            raise ValueError('Invalid cursor value')
+    elif tag == 'date':
+        if type(data) is not int:
+            raise ValueError('Invalid cursor value')
+    elif not isinstance(data, str):
+        raise ValueError('Invalid cursor value')
+
+    if tag == 'datetime':
+        offset = value['tz']
+        tz = None if offset is None else timezone(timedelta(seconds=offset))
+        return datetime(*data).replace(tzinfo=tz)
+    elif tag == 'date':
+        return date.fromordinal(data)
+    elif tag == 'time':
+        return time(*data)
+    elif tag == 'Decimal':
+        return Decimal(data)
+    elif tag == 'UUID':
+        return UUID(data)
+    elif tag == 'bytes':
+        return bytes.fromhex(data)
+    raise ValueError(f'Unknown cursor value: {tag}')
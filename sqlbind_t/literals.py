@@ -0,0 +1,164 @@
+"""Rendering of Python values as inline SQL literals
+
+Literals are used instead of bound parameters where a statement could
+exceed a parameter limit, for example long IN lists in sqlite. Dialects
+have own `Literals` subclasses, see `Dialect.LITERALS`.
+"""
+
+import math
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Type
+
+from .arrays import array_kind, is_array, scalars
+from .compat import Collection
+
+if TYPE_CHECKING:
+    from datetime import date, datetime, time
+    from decimal import Decimal
+    from uuid import UUID
+
+Formatter = Callable[[Any], str]
+
+
+class Literals:
+    """ANSI SQL literals
+
+    Formatters are `format_*` methods named in FORMATTERS, they are looked
+    up by value type MRO once per type. Lists of values of the same type
+    are joined with a single formatter, str, int and float lists and
+    numeric arrays have faster paths.
+    """
+
+    NULL = 'NULL'
+    TRUE = 'TRUE'
+    FALSE = 'FALSE'
+
+    #: Formatter method names by qualified type name, subclasses resolve
+    #: via MRO. Names are used to avoid importing decimal, uuid and so on.
+    FORMATTERS: Dict[str, str] = {
+        'builtins.NoneType': 'format_null',
+        'builtins.bool': 'format_bool',
+        'builtins.int': 'format_int',
+        'builtins.float': 'format_float',
+        'builtins.str': 'format_str',
+        'builtins.bytes': 'format_bytes',
+        'builtins.bytearray': 'format_bytes',
+        'builtins.memoryview': 'format_bytes',
+        'datetime.datetime': 'format_datetime',
+        'datetime.date': 'format_date',
+        'datetime.time': 'format_time',
+        'decimal.Decimal': 'format_decimal',
+        'uuid.UUID': 'format_uuid',
+    }
+
+    def __init__(self) -> None:
+        self._formatters: Dict[type, Optional[Formatter]] = {}
+
+    def formatter(self, tval: Type[Any]) -> Optional[Formatter]:
+        """Returns a formatter for values of a type or None if unsupported"""
+        try:
+            return self._formatters[tval]
+        except KeyError:
+            pass
+
+        fmt: Optional[Formatter] = None
+        for it in tval.__mro__:
+            name = self.FORMATTERS.get(f'{it.__module__}.{it.__qualname__}')
+            if name is not None:
+                fmt = getattr(self, name)
+                if getattr(type(self), name) is Literals.format_int:
+                    # skip a method call for not overridden int formatter
+                    fmt = int.__repr__
+                break
+        self._formatters[tval] = fmt
+        return fmt
+
+    def literal(self, value: object) -> str:
+        fmt = self.formatter(type(value))
+        if fmt is None:
+            raise ValueError(f'Invalid type: {value}')
+        return fmt(value)
+
+    def literal_list(self, values: Collection[Any]) -> str:
+        """Renders comma separated literals
+
+        Homogeneous lists skip per value calls of not overridden formatters.
+        """
+        cls = type(self)
+        if is_array(values):
+            kind = array_kind(values)
+            if kind == 'b' and cls.format_bool is Literals.format_bool:
+                return ','.join([self.TRUE if it else self.FALSE for it in scalars(values)])
+            elif kind in ('i', 'u') and cls.format_int is Literals.format_int:
+                return ','.join(map(str, scalars(values)))
+            values = list(scalars(values))
+
+        types = set(map(type, values))
+        if len(types) == 1:
+            (tval,) = types
+            if tval is int and cls.format_int is Literals.format_int:
+                return ','.join(map(int.__repr__, values))
+            elif (
+                tval is float
+                and cls.format_float is Literals.format_float
+                and all(map(math.isfinite, values))
+            ):
+                return ','.join(map(float.__repr__, values))
+            elif tval is str and cls.format_str is Literals.format_str:
+                if "'" in ''.join(values):
+                    values = [it.replace("'", "''") for it in values]
+                return "'" + "','".join(values) + "'"
+
+        formatters = {it: self.formatter(it) for it in types}
+        if None in formatters.values():
+            for it in values:
+                self.literal(it)
+        return ','.join([formatters[type(it)](it) for it in values])  # type: ignore[misc]
+
+    def write_literal_list(self, values: Sequence[Any], out: List[str], chunk: int = 1024) -> None:
+        """Appends comma separated literals into `out` by `chunk` values"""
+        for i in range(0, len(values), chunk):
+            if i:
+                out.append(',')
+            out.append(self.literal_list(values[i : i + chunk]))
+
+    def format_null(self, value: None) -> str:
+        return self.NULL
+
+    def format_bool(self, value: bool) -> str:
+        return self.TRUE if value else self.FALSE
+
+    def format_int(self, value: int) -> str:
+        return int.__repr__(value)
+
+    def format_float(self, value: float) -> str:
+        if math.isfinite(value):
+            return float.__repr__(value)
+        return self.format_nonfinite(value)
+
+    def format_nonfinite(self, value: float) -> str:
+        raise ValueError(f'Invalid value: {value}')
+
+    def format_str(self, value: str) -> str:
+        return "'{}'".format(value.replace("'", "''"))
+
+    def format_bytes(self, value: bytes) -> str:
+        return f"X'{bytes(value).hex()}'"
+
+    def format_datetime(self, value: 'datetime') -> str:
+        if value.tzinfo is None:
+            return f"TIMESTAMP '{value.isoformat(' ')}'"
+        return f"TIMESTAMP WITH TIME ZONE '{value.isoformat(' ')}'"
+
+    def format_date(self, value: 'date') -> str:
+        return f"DATE '{value.isoformat()}'"
+
+    def format_time(self, value: 'time') -> str:
+        return f"TIME '{value.isoformat()}'"
+
+    def format_decimal(self, value: 'Decimal') -> str:
+        if value.is_finite():
+            return str(value)
+        return self.format_nonfinite(float(value))
+
+    def format_uuid(self, value: 'UUID') -> str:
+        return f"'{value}'"
@@ -0,0 +1,188 @@
+from copy import copy
+from inspect import Parameter, signature
+from itertools import islice
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, cast
+
+from . import SQL, AnySQL, Slot
+from .dialect import Dialect, DialectOp, FrozenOp, fill_shape, split_shape
+from .query_params import ListQueryParams, ParamsT
+from .template import Interpolation, Template
+
+_POSITIONAL = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+
+
+class Plan(Generic[ParamsT]):
+    """Precompiled query, see `sqlbind_t.compile`
+
+    Plan keeps static SQL chunks and an ordered list of parameter sources:
+    slots, constants and dialect ops. Ops like `IN` or `LIKE`
+    could produce different SQL depending on a value (sqlite inlines long
+    IN lists) and are rendered on each bind, such plans are `dynamic`.
+    Slots nested into ops or lists are substituted on each bind too.
+    Plans without dynamic slots hold pre-joined SQL text unless params
+    deduplicate values. None bound to a slot compared with `=` renders
+    the builder again, see `Slot.nullable`. Builders with conditions over
+    arguments (`not_none`, `truthy`, `cond`) are rendered on each bind,
+    see `conditional`.
+    """
+
+    def __init__(
+        self,
+        builder: Callable[..., AnySQL],
+        dialect: Optional[Dialect],
+        params: Callable[[], ParamsT],
+        names: Optional[Sequence[str]] = None,
+    ) -> None:
+        if names is None:
+            names = [
+                it.name for it in signature(builder).parameters.values() if it.kind in _POSITIONAL
+            ]
+        self.builder = builder
+        self.dialect = dialect or Dialect()
+        self.params = params
+        self.nargs = len(names)
+
+        slots = [Slot(i, it) for i, it in enumerate(names)]
+        structure, sources = self.dialect.shape(builder(*slots))
+        self._chunks = split_shape(structure)
+        self._sources = sources
+        self._nested = frozenset(
+            i for i, it in enumerate(sources) if not isinstance(it, Slot) and has_slot(it)
+        )
+        self._nullable = [it.index for it in slots if it.nullable]
+        #: Builder evaluated conditions over arguments, SQL text depends on values
+        self.conditional = any(it.conditional for it in slots)
+        self.dynamic = bool(self._nested) or any(isinstance(it, DialectOp) for it in sources)
+
+        consts: List[object] = []
+        indexes: List[int] = []
+        for it in sources:
+            if isinstance(it, Slot):
+                indexes.append(it.index)
+            else:
+                indexes.append(self.nargs + len(consts))
+                consts.append(it)
+        self._consts = tuple(consts)
+        self._indexes = indexes
+        self._direct = not consts and indexes == list(range(self.nargs))
+
+        sample = params()
+        self._positional = isinstance(sample, ListQueryParams)
+        self.sql: Optional[str] = None
+        # With deduplication placeholders depend on actual values
+        if not self.dynamic and not self.conditional and not sample.dedup:
+            self.sql = fill_shape(self._chunks, sources, sample, self.dialect)
+
+    def bind(self, *args: object) -> Tuple[str, ParamsT]:
+        """Returns SQL and parameters for plan arguments"""
+        if len(args) != self.nargs:
+            raise TypeError(f'Plan takes {self.nargs} arguments but {len(args)} were given')
+
+        params = self.params()
+        if self.conditional or self._nullable and self._has_null(args):
+            return self.dialect.render(self.builder(*args), params)
+        if self.sql is None:
+            return self._render(args, params), params
+
+        params.extend_values(self._values(args))
+        return self.sql, params
+
+    def bind_params(self, *args: object) -> ParamsT:
+        """Returns only parameters, SQL text of static plans is in `sql`
+
+        Raises ValueError if SQL text differs for arguments, i.e. None is
+        bound to a slot compared with `=`.
+        """
+        if self.sql is None:
+            return self.bind(*args)[1]
+        if self._nullable and self._has_null(args):
+            raise ValueError('SQL text depends on None arguments, use bind()')
+
+        params = self.params()
+        params.extend_values(self._values(args))
+        return params
+
+    def bind_tuple(self, *args: object) -> Tuple[str, Tuple[object, ...]]:
+        """Returns SQL and parameters as a tuple for positional param styles"""
+        if not self._positional:
+            raise TypeError('bind_tuple requires a positional parameter style')
+        if self.sql is None or self._nullable and self._has_null(args):
+            sql, params = self.bind(*args)
+            return sql, tuple(cast(ListQueryParams, params))
+        if len(args) != self.nargs:
+            raise TypeError(f'Plan takes {self.nargs} arguments but {len(args)} were given')
+        return self.sql, tuple(self._values(args))
+
+    def _has_null(self, args: Tuple[object, ...]) -> bool:
+        for it in self._nullable:
+            if args[it] is None:
+                return True
+        return False
+
+    def _values(self, args: Tuple[object, ...]) -> Sequence[object]:
+        if self._direct:
+            return args
+        if self._consts:
+            args = args + self._consts
+        return [args[it] for it in self._indexes]
+
+    def _render(self, args: Tuple[object, ...], params: ParamsT) -> str:
+        chunks = self._chunks
+        result = [chunks[0]]
+        params.reserve(len(self._sources))
+        compile = params.compile
+        nested = self._nested
+        for i, (value, chunk) in enumerate(zip(self._values(args), islice(chunks, 1, None))):
+            if i in nested:
+                value = substitute(value, args)
+            if isinstance(value, DialectOp):
+                result.append(value.render(params, self.dialect))
+            else:
+                result.append(compile(value))
+            result.append(chunk)
+        return ''.join(result)
+
+
+def op_fields(cls: type) -> List[str]:
+    return [it for base in cls.__mro__ for it in getattr(base, '__slots__', ())]
+
+
+def has_slot(value: object) -> bool:
+    """Checks if a value contains slots, rejects frozen fragments with slots"""
+    if isinstance(value, Slot):
+        return True
+    elif isinstance(value, FrozenOp):
+        if has_slot(value.value):
+            raise ValueError('Frozen fragments can not depend on plan arguments')
+        return False
+    elif isinstance(value, DialectOp):
+        return any(has_slot(getattr(value, it, None)) for it in op_fields(type(value)))
+    elif isinstance(value, (SQL, Template)):
+        return any(isinstance(it, Interpolation) and has_slot(it.value) for it in value)
+    elif type(value) in (list, tuple):
+        return any(has_slot(it) for it in value)  # type: ignore[attr-defined]
+    return False
+
+
+def substitute(value: Any, args: Tuple[object, ...]) -> Any:
+    """Returns a copy of a value with slots replaced by arguments"""
+    if isinstance(value, Slot):
+        return args[value.index]
+    elif isinstance(value, FrozenOp):
+        return value
+    elif isinstance(value, DialectOp):
+        op = copy(value)
+        for it in op_fields(type(value)):
+            if hasattr(value, it):
+                setattr(op, it, substitute(getattr(value, it), args))
+        return op
+    elif isinstance(value, (SQL, Template)):
+        return SQL(
+            *[
+                Interpolation(substitute(it.value, args)) if isinstance(it, Interpolation) else it
+                for it in value
+            ]
+        )
+    elif type(value) in (list, tuple):
+        return type(value)(substitute(it, args) for it in value)
+    return value
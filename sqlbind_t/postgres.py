@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING
+
+from .arrays import as_list
+from .dialect import Dialect as BaseDialect
+from .dialect import IN_Op
+from .literals import Literals as BaseLiterals
+from .query_params import QueryParams
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+    from uuid import UUID
+
+
+class Literals(BaseLiterals):
+    """PostgreSQL literals, expects standard_conforming_strings=on (default)"""
+
+    def format_nonfinite(self, value: float) -> str:
+        return f"'{FLOAT_SPECIAL[repr(value)]}'::float8"
+
+    def format_decimal(self, value: 'Decimal') -> str:
+        if value.is_finite():
+            return str(value)
+        return f"'{FLOAT_SPECIAL[repr(float(value))]}'::numeric"
+
+    def format_bytes(self, value: bytes) -> str:
+        return f"'\\x{bytes(value).hex()}'::bytea"
+
+    def format_uuid(self, value: 'UUID') -> str:
+        return f"'{value}'::uuid"
+
+
+FLOAT_SPECIAL = {'nan': 'NaN', 'inf': 'Infinity', '-inf': '-Infinity'}
+
+
+class Dialect(BaseDialect):
+    """PostgreSQL dialect
+
+    IN lists are bound as a single array parameter, `field = ANY(%s)` and
+    `field <> ALL(%s)` for NOT IN. Statement text doesn't depend on a list
+    length, so server-side prepared statements and driver statement caches
+    are reused. Empty lists are handled by PostgreSQL itself.
+    """
+
+    FALSE = 'FALSE'
+    TRUE = 'TRUE'
+    LITERALS: BaseLiterals = Literals()
+    ROW_VALUES = True
+
+    def IN(self, op: IN_Op, params: QueryParams) -> str:
+        f = self.safe_str(op.field, params)
+        mark = params.compile(as_list(op.value))
+        if op.op == 'NOT IN':
+            return f'{f} <> ALL({mark})'
+        return f'{f} = ANY({mark})'
@@ -0,0 +1,135 @@
+"""Render statistics, see `Dialect.profile`"""
+
+import threading
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from . import AnySQL
+from .dialect import OP, VALUE, Dialect, DialectOp, Shape
+from .query_params import QueryParams
+
+Record = Dict[str, Any]
+
+#: Fingerprint for renders after `Profiler.maxsize` distinct ones
+OTHER = '<other>'
+
+
+def fingerprint(shape: Shape) -> str:
+    """Returns query text with `?` for values and `{METHOD}` for dialect ops"""
+    structure, values = shape
+    result = []
+    idx = 0
+    for it in structure:
+        if it is VALUE:
+            result.append('?')
+        elif it is OP:
+            result.append(f'{{{values[idx].method}}}')  # type: ignore[attr-defined]
+        else:
+            result.append(it)  # type: ignore[arg-type]
+            continue
+        idx += 1
+    return ''.join(result)
+
+
+class Profiler:
+    """Aggregates render statistics by query fingerprint
+
+    Fingerprint is a query shape: static SQL with `?` in place of values
+    and `{IN}`, `{LIKE}`, ... in place of dialect ops, so it doesn't
+    depend on a parameter style or op output like IN list sizes. For each
+    fingerprint it counts renders, total time, query parts, parameters,
+    SQL length and count and time of each DialectOp type. `callback` is
+    called with a record of every render.
+    """
+
+    def __init__(
+        self, callback: Optional[Callable[[Record], None]] = None, *, maxsize: int = 1000
+    ) -> None:
+        self.callback = callback
+        self.maxsize = maxsize
+        self._stats: Dict[str, Record] = {}
+        self._lock = threading.Lock()
+
+    def run(self, dialect: Dialect, query: AnySQL, params: QueryParams, out: List[str]) -> None:
+        """Renders query into `out` with `Dialect._write` and records stats"""
+        nparams = len(params)  # type: ignore[arg-type]
+        counter = Counter(dialect, out)
+        start = perf_counter()
+        dialect._write(query, params, counter, counter.write_op)
+        elapsed = perf_counter() - start
+
+        shape = dialect._shape(query)
+        record = {
+            'fingerprint': fingerprint(shape),
+            'time': elapsed,
+            'nodes': len(shape[0]),
+            'params': len(params) - nparams,  # type: ignore[arg-type]
+            'sql_length': counter.size,
+            'ops': {k: {'count': v[0], 'time': v[1]} for k, v in counter.ops.items()},
+        }
+        self._add(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def snapshot(self) -> Dict[str, Record]:
+        """Returns a copy of aggregated stats by fingerprint"""
+        with self._lock:
+            return {
+                k: dict(v, ops={name: dict(it) for name, it in v['ops'].items()})
+                for k, v in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _add(self, record: Record) -> None:
+        key = record['fingerprint']
+        with self._lock:
+            stats = self._stats
+            if key not in stats and len(stats) >= self.maxsize:
+                key = OTHER
+
+            entry = stats.get(key)
+            if entry is None:
+                entry = stats[key] = {
+                    'count': 0,
+                    'time': 0.0,
+                    'nodes': 0,
+                    'params': 0,
+                    'sql_length': 0,
+                    'ops': {},
+                }
+            entry['count'] += 1
+            for it in ('time', 'nodes', 'params', 'sql_length'):
+                entry[it] += record[it]
+            for name, op in record['ops'].items():
+                total = entry['ops'].setdefault(name, {'count': 0, 'time': 0.0})
+                total['count'] += op['count']
+                total['time'] += op['time']
+
+
+class Counter(List[str]):
+    """Output and op writer of `Dialect._write` collecting statistics
+
+    Counts characters appended to `out` and times ops passed to
+    `write_op`, so rendering itself isn't duplicated.
+    """
+
+    def __init__(self, dialect: Dialect, out: List[str]) -> None:
+        list.__init__(self)
+        self.dialect = dialect
+        self.out = out
+        self.size = 0
+        self.ops: Dict[str, List[float]] = {}
+
+    def append(self, part: str) -> None:
+        self.size += len(part)
+        self.out.append(part)
+
+    def write_op(self, op: DialectOp[Any], params: QueryParams, out: List[str]) -> None:
+        start = perf_counter()
+        self.dialect.write_op(op, params, out)
+        cost = self.ops.setdefault(type(op).__name__, [0, 0.0])
+        cost[0] += 1
+        cost[1] += perf_counter() - start
@@ -1,28 +1,165 @@
-from typing import Dict, List, TypeVar
+import sys
+from typing import Dict, Hashable, Iterable, List, Optional, TypeVar
 
 ParamsT = TypeVar('ParamsT', bound='QueryParams')
 
 
+class Placeholders(Dict[int, str]):
+    """Lazily formatted and interned placeholders by parameter position
+
+    Only positions below `limit` are kept, placeholders of larger
+    statements are formatted on each use.
+    """
+
+    def __init__(self, fmt: str, limit: int = 1 << 16) -> None:
+        dict.__init__(self)
+        self.fmt = fmt
+        self.limit = limit
+
+    def __missing__(self, position: int) -> str:
+        value = self.fmt.format(position)
+        if position < self.limit:
+            value = self[position] = sys.intern(value)
+        return value
+
+    def reserve(self, count: int) -> None:
+        """Preformats placeholders for positions below `count`"""
+        for it in range(len(self), min(count, self.limit)):
+            self[it]
+
+
+NUMERIC = Placeholders(':{}')
+DOLLAR = Placeholders('${}')
+NAMES = Placeholders('p{}')
+NAMED = Placeholders(':p{}')
+PYFORMAT = Placeholders('%(p{})s')
+
+
+DEDUP_MODES = (None, 'identity', 'equality')
+
+
+EXACT_TYPES = {str, int, bool, bytes, type(None)}
+
+
+def dedup_key(value: object, mode: str) -> Hashable:
+    """Returns a key to find already bound values
+
+    `identity` mode matches the same objects. `equality` also matches
+    equal hashable values of the same type and representation, so `1` and
+    `True`, `(1,)` and `(True,)` or `Decimal('1')` and `Decimal('1.00')`
+    are different.
+    """
+    if mode == 'equality':
+        tp = type(value)
+        if tp in EXACT_TYPES:
+            return (tp, value)
+        elif tp is tuple:
+            return (tp, tuple([dedup_key(it, mode) for it in value]))  # type: ignore[attr-defined]
+        try:
+            hash(value)
+        except TypeError:
+            pass
+        else:
+            # equal values could differ in precision, sign of zero or timezone
+            return (tp, value, repr(value))
+    return id(value)
+
+
 class QueryParams:
+    #: Reuse placeholders for already bound values, see `dedup_key`
+    dedup: Optional[str] = None
+
     def compile(self, value: object) -> str:  # pragma: no cover
         raise NotImplementedError
 
+    def extend_values(self, values: Iterable[object]) -> None:
+        """Adds values without returning placeholders"""
+        for it in values:
+            self.compile(it)
+
+    def reserve(self, count: int) -> None:
+        """Capacity hint: `count` more values are going to be added"""
+
 
 class ListQueryParams(QueryParams, List[object]):
-    pass
+    placeholders: Optional[Placeholders] = None
+
+    def extend_values(self, values: Iterable[object]) -> None:
+        self.extend(values)
+
+    def reserve(self, count: int) -> None:
+        if self.placeholders is not None:
+            # positions start from 1
+            self.placeholders.reserve(len(self) + count + 1)
+
+
+class NumberedQueryParams(ListQueryParams):
+    """Base for positional styles referencing parameters by a number"""
+
+    placeholders: Placeholders
+
+    def __init__(self, values: Iterable[object] = (), *, dedup: Optional[str] = None) -> None:
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f'Unknown dedup mode: {dedup}')
+        list.__init__(self, values)
+        self.dedup = dedup
+        self._seen: Dict[Hashable, str] = {}
+
+    def compile(self, value: object) -> str:
+        if self.dedup:
+            key = dedup_key(value, self.dedup)
+            mark = self._seen.get(key)
+            if mark is None:
+                self.append(value)
+                mark = self._seen[key] = self.placeholders[len(self)]
+            return mark
+
+        self.append(value)
+        return self.placeholders[len(self)]
+
+    def extend_values(self, values: Iterable[object]) -> None:
+        if self.dedup:
+            QueryParams.extend_values(self, values)
+        else:
+            self.extend(values)
 
 
 class DictQueryParams(QueryParams, Dict[str, object]):
-    def __init__(self) -> None:
+    placeholders: Placeholders = NAMES
+
+    def __init__(self, *, dedup: Optional[str] = None) -> None:
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f'Unknown dedup mode: {dedup}')
         dict.__init__(self, {})
         self._count = 0
+        self.dedup = dedup
+        self._seen: Dict[Hashable, str] = {}
 
     def add(self, value: object) -> str:
-        name = f'p{self._count}'
+        name = NAMES[self._count]
         self[name] = value
         self._count += 1
         return name
 
+    def compile(self, value: object) -> str:
+        if self.dedup:
+            key = dedup_key(value, self.dedup)
+            mark = self._seen.get(key)
+            if mark is None:
+                mark = self._seen[key] = self.placeholders[self._count]
+                self.add(value)
+            return mark
+
+        count = self._count
+        self[NAMES[count]] = value
+        self._count = count + 1
+        return self.placeholders[count]
+
+    def reserve(self, count: int) -> None:
+        size = self._count + count
+        NAMES.reserve(size)
+        self.placeholders.reserve(size)
+
 
 class QMarkQueryParams(ListQueryParams):
     """QueryParams implementation for qmark (?) parameter style"""
@@ -40,31 +177,25 @@ class FormatQueryParams(ListQueryParams):
         return '%s'
 
 
-class NumericQueryParams(ListQueryParams):
+class NumericQueryParams(NumberedQueryParams):
     """QueryParams implementation for numeric (:1, :2) parameter style"""
 
-    def compile(self, value: object) -> str:
-        self.append(value)
-        return f':{len(self)}'
+    placeholders = NUMERIC
 
 
-class DollarQueryParams(ListQueryParams):
+class DollarQueryParams(NumberedQueryParams):
     """QueryParams implementation for format ($1, $2, ...) parameter style"""
 
-    def compile(self, value: object) -> str:
-        self.append(value)
-        return f'${len(self)}'
+    placeholders = DOLLAR
 
 
 class NamedQueryParams(DictQueryParams):
     """QueryParams implementation for named (:name) parameter style"""
 
-    def compile(self, value: object) -> str:
-        return f':{self.add(value)}'
+    placeholders = NAMED
 
 
 class PyFormatQueryParams(DictQueryParams):
     """QueryParams implementation for pyformat (%(name)s) parameter style"""
 
-    def compile(self, value: object) -> str:
-        return f'%({self.add(value)})s'
+    placeholders = PYFORMAT
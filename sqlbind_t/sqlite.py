@@ -1,38 +1,136 @@
-from typing import Union
+import json
+import math
+from typing import TYPE_CHECKING, Any, List, Tuple, Union
 
+from .arrays import as_list
 from .compat import Collection
 from .dialect import Dialect as BaseDialect
-from .dialect import IN_Op
+from .dialect import DialectOp, IN_Op
+from .literals import Literals as BaseLiterals
 from .query_params import QueryParams
 
+if TYPE_CHECKING:
+    from datetime import date, datetime, time
+
+try:
+    from sqlite3 import sqlite_version_info
+except ImportError:  # pragma: no cover
+    sqlite_version_info: Tuple[int, int, int] = (0, 0, 0)  # type: ignore[no-redef]
+
+
+class Literals(BaseLiterals):
+    """SQLite literals
+
+    Dates and times are ISO strings like sqlite3 adapters store them.
+    NaN is NULL and infinities are out of range reals.
+    """
+
+    TRUE = '1'
+    FALSE = '0'
+
+    def format_nonfinite(self, value: float) -> str:
+        if math.isnan(value):
+            return self.NULL
+        return '9e999' if value > 0 else '-9e999'
+
+    def format_datetime(self, value: 'datetime') -> str:
+        return f"'{value.isoformat(' ')}'"
+
+    def format_date(self, value: 'date') -> str:
+        return f"'{value.isoformat()}'"
+
+    def format_time(self, value: 'time') -> str:
+        return f"'{value.isoformat()}'"
+
+
+LITERALS = Literals()
+
 
 class Dialect(BaseDialect):
     FALSE = '0'
+    TRUE = '1'
+    LITERALS: BaseLiterals = LITERALS
     IN_MAX_VALUES = 10
+    # SQLITE_MAX_VARIABLE_NUMBER default
+    MAX_PARAMS = 32766 if sqlite_version_info >= (3, 32, 0) else 999
+    ROW_VALUES = sqlite_version_info >= (3, 15, 0)
+
+    #: How IN renders lists, could be changed per instance:
+    #:
+    #: * `inline`: a parameter per value, lists longer than IN_MAX_VALUES
+    #:   are inlined as escaped literals.
+    #: * `json`: whole list is bound as a single JSON parameter,
+    #:   `IN (SELECT value FROM json_each(?))`. Statement text doesn't
+    #:   depend on a list, so sqlite3 statement cache is reused. Lists
+    #:   with values JSON can't represent as sqlite3 binds them (bytes,
+    #:   dates, Decimal, NaN, ...) are rendered with `inline`.
+    IN_STRATEGY = 'inline'
+
+    def in_strategy(self, values: List[object]) -> str:
+        """Returns how IN renders a non-empty list: `json`, `params` or `literals`"""
+        if self.IN_STRATEGY == 'json':
+            if json_safe(values):
+                return 'json'
+        elif self.IN_STRATEGY != 'inline':
+            raise ValueError(f'Unknown IN strategy: {self.IN_STRATEGY}')
+
+        # Trying to escape and assemble SQL manually to avoid too many
+        # parameters exception
+        return 'literals' if len(values) > self.IN_MAX_VALUES else 'params'
 
     def IN(self, op: IN_Op, params: QueryParams) -> str:
-        values: Collection[Union[float, int, str]] = op.value  # type: ignore[assignment]
+        values = as_list(op.value)
         if not values:
-            return self.FALSE
+            return self.TRUE if op.op == 'NOT IN' else self.FALSE
 
         f = self.safe_str(op.field, params)
-        if len(values) > self.IN_MAX_VALUES:
-            # Trying to escape and assemble SQL manually to avoid too many
-            # parameters exception
-            return f'{f} IN ({sqlite_value_list(values)})'
+        strategy = self.in_strategy(values)
+        if strategy == 'json':
+            mark = params.compile(json.dumps(values))
+            return f'{f} {op.op} (SELECT value FROM json_each({mark}))'
+        elif strategy == 'literals':
+            return f'{f} {op.op} ({self.LITERALS.literal_list(values)})'
+
+        compile = params.compile
+        marks = []
+        for it in values:
+            marks.append(compile(it))
+
+        # Pad with the last value up to a bucket size, see IN_BUCKETS
+        padding = min(self.in_bucket(len(marks)), self.IN_MAX_VALUES) - len(marks)
+        for _ in range(padding):
+            marks.append(compile(it))
+        return f'{f} {op.op} ({", ".join(marks)})'
+
+    def write_op(self, op: DialectOp[Any], params: QueryParams, out: List[str]) -> None:
+        if type(op) is IN_Op:
+            values = as_list(op.value)
+            if values and self.in_strategy(values) == 'literals':
+                # long lists are written in pieces, see Dialect.render_to
+                out.append(f'{self.safe_str(op.field, params)} {op.op} (')
+                self.LITERALS.write_literal_list(values, out)
+                out.append(')')
+                return
+        out.append(op.render(params, self))
+
+
+JSON_TYPES = {str, int, bool, type(None)}
+
 
-        mark_list = ', '.join(params.compile(it) for it in values)
-        return f'{f} IN ({mark_list})'
+def json_safe(values: List[object]) -> bool:
+    """Checks if values survive a JSON round trip as sqlite3 would bind them"""
+    for it in values:
+        if type(it) is float:
+            if not math.isfinite(it):
+                return False
+        elif type(it) not in JSON_TYPES:
+            return False
+    return True
 
 
 def sqlite_escape(val: Union[float, int, str]) -> str:
-    tval = type(val)
-    if tval is str:
-        return "'{}'".format(val.replace("'", "''"))  # type: ignore[union-attr]
-    elif tval is int or tval is float:
-        return str(val)
-    raise ValueError(f'Invalid type: {val}')
+    return LITERALS.literal(val)
 
 
 def sqlite_value_list(values: Collection[Union[float, int, str]]) -> str:
-    return ','.join(map(sqlite_escape, values))
+    return LITERALS.literal_list(values)
@@ -1,18 +1,23 @@
-import ast
 import sys
-from ast import Expression, FormattedValue
-from typing import TYPE_CHECKING, Iterator, List, Union
+from types import CodeType
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
 
+from .cache import LRUCache
 from .compat import pyver
 
 HAS_TSTRINGS = sys.version_info[:2] >= (3, 14)
 
 TemplatePart = Union[str, 'Interpolation']
 
-__all__ = ['Template', 'Interpolation']
+__all__ = ['Template', 'Interpolation', 'check_template']
+
+if TYPE_CHECKING:
+    import ast
 
 
 class NTemplate:
+    __slots__ = ('_parts',)
+
     def __init__(self, *parts: TemplatePart):
         self._parts = parts
 
@@ -27,6 +32,8 @@ class NTemplate:
 
 
 class NInterpolation:
+    __slots__ = ('value',)
+
     def __init__(self, value: object) -> None:
         self.value = value
 
@@ -48,18 +55,57 @@ else:
         Interpolation = NInterpolation
 
 
-def parse_template(string: str, *, level: int = 1) -> Template:
-    root = ast.parse('f' + repr(string), mode='eval')
-    frame = sys._getframe(level)
-    values: List[Union[str, Interpolation]] = []
+#: Literal parts (None for interpolations) and a code object evaluating
+#: a tuple of all interpolation values
+CompiledTemplate = Tuple[Tuple[Optional[str], ...], Optional[CodeType]]
+
+#: Template string -> CompiledTemplate cache of `parse_template`
+parse_cache: LRUCache[str, CompiledTemplate] = LRUCache(256)
+
+
+def check_template(arg: str) -> Template:
+    # arg is str from type checker perspective, but transform
+    # converts prefixed f-strings into a Template instances.
+    if isinstance(arg, Template):
+        return arg
+    raise RuntimeError(
+        '(check_template) accepts only a prefixed f-string like sqlf(f"@SELECT ...")'
+    )
+
+
+def compile_template(string: str) -> CompiledTemplate:
+    from ast import Expression, FormattedValue, Load, Tuple, fix_missing_locations, parse
+
+    root = parse('f' + repr(string), mode='eval')
+    parts: List[Optional[str]] = []
+    exprs: List['ast.expr'] = []
     for it in root.body.values:  # type: ignore[attr-defined]
         if type(it) is FormattedValue:
-            code = compile(Expression(it.value), '<string>', 'eval')
-            value = eval(code, frame.f_globals, frame.f_locals)
-            values.append(Interpolation(value))
+            parts.append(None)
+            exprs.append(it.value)
         else:
             if pyver < (3, 8):  # pragma: no cover
-                values.append(it.s)
+                parts.append(it.s)
             else:
-                values.append(it.value)
-    return Template(*values)
+                parts.append(it.value)
+
+    code = None
+    if exprs:
+        body = Expression(Tuple(elts=exprs, ctx=Load()))
+        code = compile(fix_missing_locations(body), '<string>', 'eval')
+    return tuple(parts), code
+
+
+def parse_template(string: str, *, level: int = 1) -> Template:
+    compiled = parse_cache.get(string)
+    if compiled is None:
+        compiled = compile_template(string)
+        parse_cache.set(string, compiled)
+
+    parts, code = compiled
+    if code is None:
+        return Template(*parts)  # type: ignore[arg-type]
+
+    frame = sys._getframe(level)
+    values = iter(eval(code, frame.f_globals, frame.f_locals))
+    return Template(*[Interpolation(next(values)) if it is None else it for it in parts])
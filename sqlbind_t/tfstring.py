@@ -1,4 +1,8 @@
+import hashlib
 import importlib.abc
+import marshal
+import os
+import struct
 import sys
 from ast import (
     AST,
@@ -16,10 +20,14 @@ from ast import (
     parse,
 )
 from importlib.machinery import PathFinder
-from typing import Any, List, Optional
+from importlib.util import MAGIC_NUMBER
+from types import CodeType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from .compat import pyver
-from .template import Template
+from .template import check_template
+
+__all__ = ['check_template', 'init', 'transform_fstrings']
 
 if pyver < (3, 8):  # pragma: no cover
     from ast import Str
@@ -94,14 +102,77 @@ def transform_fstrings(tree: Module, sigil: str) -> Module:
     return new_tree
 
 
-def check_template(arg: str) -> Template:
-    # arg is str from type checker perspective, but transform
-    # converts prefixed f-strings into a Template instances.
-    if isinstance(arg, Template):
-        return arg
-    raise RuntimeError(
-        '(check_template) accepts only a prefixed f-string like sqlf(f"@SELECT ...")'
-    )
+def cache_tag(sigil: str, rewrite_pytest: bool = False) -> str:
+    """Returns bytecode cache tag for transform options
+
+    Tag changes with sigil, sqlbind_t version and pytest assertion rewriting
+    so bytecode produced with different options is never mixed.
+    """
+    from . import version
+
+    key = f'{sigil}\0{version}'
+    if rewrite_pytest:
+        from _pytest import __version__ as pytest_version
+
+        key += f'\0pytest-{pytest_version}'
+    return 'sqlbind_t-' + hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def cache_path(path: str, tag: str, optimize: int = -1) -> Optional[str]:
+    """Returns bytecode path for a source path, see `cache_tag`"""
+    impl_tag = sys.implementation.cache_tag
+    if impl_tag is None:  # pragma: no cover
+        return None
+
+    if optimize < 0:
+        optimize = sys.flags.optimize
+    opt = f'.opt-{optimize}' if optimize else ''
+    head, tail = os.path.split(path)
+    base = tail.rpartition('.')[0]
+    return os.path.join(head, '__pycache__', f'{base}.{impl_tag}.{tag}{opt}.pyc')
+
+
+def bytecode_header(source_stats: Dict[str, Any]) -> bytes:
+    mtime = int(source_stats['mtime']) & 0xFFFFFFFF
+    size = int(source_stats['size']) & 0xFFFFFFFF
+    return MAGIC_NUMBER + struct.pack('<III', 0, mtime, size)
+
+
+def load_bytecode(data: bytes, header: bytes) -> Optional[CodeType]:
+    """Returns code from cached data or None if it's stale or invalid"""
+    if data[: len(header)] != header:
+        return None
+    try:
+        code = marshal.loads(data[len(header) :])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return code if isinstance(code, CodeType) else None
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def compile_source(data: bytes, path: str, sigil: str, *, optimize: int = -1) -> CodeType:
+    tree = transform_fstrings(parse(data, filename=path), sigil)
+    code: CodeType = compile(tree, path, 'exec', optimize=optimize, dont_inherit=True)
+    return code
+
+
+def source_stats(path: str) -> Dict[str, Any]:
+    st = os.stat(path)
+    return {'mtime': st.st_mtime, 'size': st.st_size}
 
 
 class TransformingLoader(importlib.abc.SourceLoader):
@@ -127,13 +198,46 @@ class TransformingLoader(importlib.abc.SourceLoader):
         with open(path, 'rb') as f:
             return f.read()
 
+    def path_stats(self, path: str) -> Dict[str, Any]:
+        return source_stats(path)
+
+    def set_data(self, path: str, data: bytes) -> None:
+        write_atomic(path, data)
+
+    def get_code(self, fullname: str) -> CodeType:
+        # SourceLoader.get_code stores bytecode in a standard location
+        # shared with untransformed modules, so caching is reimplemented
+        # with own cache tag.
+        source_path = self.path
+        bytecode_path = cache_path(source_path, cache_tag(self.sigil, self._rewrite_pytest))
+        header = bytecode_header(self.path_stats(source_path))
+        if bytecode_path:
+            try:
+                data = self.get_data(bytecode_path)
+            except OSError:
+                pass
+            else:
+                cached = load_bytecode(data, header)
+                if cached is not None:
+                    return cached
+
+        data = self.get_data(source_path)
+        code: CodeType = self.source_to_code(data, source_path)  # type: ignore[no-untyped-call]
+        if bytecode_path and not sys.dont_write_bytecode:
+            try:
+                self.set_data(bytecode_path, header + marshal.dumps(code))
+            except OSError:
+                pass
+        return code
+
     def source_to_code(self, data, path, *, _optimize=-1):  # type: ignore[no-untyped-def,override]
-        tree = parse(data, filename=path)
-        new_tree = transform_fstrings(tree, self.sigil)
-        if self._rewrite_pytest:
-            from _pytest.assertion.rewrite import rewrite_asserts
+        if not self._rewrite_pytest:
+            return compile_source(data, path, self.sigil, optimize=_optimize)
+
+        from _pytest.assertion.rewrite import rewrite_asserts
 
-            rewrite_asserts(new_tree, data, path, self._pytest_hook.config)
+        new_tree = transform_fstrings(parse(data, filename=path), self.sigil)
+        rewrite_asserts(new_tree, data, path, self._pytest_hook.config)
         return compile(new_tree, path, 'exec', optimize=_optimize, dont_inherit=True)
 
 
@@ -145,25 +249,28 @@ class DummyState:
 
 class TransformingFinder(PathFinder):
     def __init__(self, prefixes: List[str], sigil: str, *, pytest_hook: Any = None) -> None:
-        self._sqlbind_prefixes = prefixes
+        # str.startswith with a tuple checks all prefixes in one call
+        self._sqlbind_prefixes = tuple(prefixes)
         self._sigil = sigil
         self._pytest_hook = pytest_hook
 
     def find_spec(self, fullname, path, target=None):  # type: ignore[no-untyped-def,override]
+        # Other finders handle non matching modules, skip filesystem lookup
+        if not fullname.startswith(self._sqlbind_prefixes):
+            return None
+
         spec = super().find_spec(fullname, path, target=target)
-        if any(fullname.startswith(it) for it in self._sqlbind_prefixes):
-            if spec and spec.origin and spec.origin.endswith('.py'):
-                rewrite_pytest = self._pytest_hook and self._pytest_hook._should_rewrite(
-                    fullname, spec.origin, DummyState
-                )
-                spec.loader = TransformingLoader(
-                    fullname,
-                    spec.origin,
-                    sigil=self._sigil,
-                    rewrite_pytest=rewrite_pytest,
-                    pytest_hook=self._pytest_hook,
-                )
-                return spec
+        if spec and spec.origin and spec.origin.endswith('.py'):
+            rewrite_pytest = self._pytest_hook and self._pytest_hook._should_rewrite(
+                fullname, spec.origin, DummyState
+            )
+            spec.loader = TransformingLoader(
+                fullname,
+                spec.origin,
+                sigil=self._sigil,
+                rewrite_pytest=rewrite_pytest,
+                pytest_hook=self._pytest_hook,
+            )
         return spec
 
 
@@ -175,3 +282,100 @@ def init(prefixes: List[str], pytest: bool = False, sigil: str = '@') -> None:
         pytest_hook = next(it for it in sys.meta_path if isinstance(it, AssertionRewritingHook))
 
     sys.meta_path.insert(0, TransformingFinder(prefixes, sigil, pytest_hook=pytest_hook))
+
+
+def iter_sources(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(it for it in dirs if it != '__pycache__')
+                for name in sorted(files):
+                    if name.endswith('.py'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def precompile(path: str, sigil: str, optimize: int = -1) -> Tuple[str, Optional[str]]:
+    """Writes transformed bytecode for a source file
+
+    Returns source path and an error message if compilation failed.
+    """
+    bytecode_path = cache_path(path, cache_tag(sigil), optimize)
+    if not bytecode_path:  # pragma: no cover
+        return path, 'bytecode caching is not supported'
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        header = bytecode_header(source_stats(path))
+        code = compile_source(data, path, sigil, optimize=optimize)
+        write_atomic(bytecode_path, header + marshal.dumps(code))
+    except (OSError, SyntaxError, ValueError) as e:
+        return path, f'{e.__class__.__name__}: {e}'
+    return path, None
+
+
+def is_stale(path: str, sigil: str, optimize: int = -1) -> bool:
+    """Checks if precompiled bytecode is missing or outdated"""
+    bytecode_path = cache_path(path, cache_tag(sigil), optimize)
+    if not bytecode_path:  # pragma: no cover
+        return True
+    try:
+        with open(bytecode_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return True
+    return load_bytecode(data, bytecode_header(source_stats(path))) is None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of `python -m sqlbind_t.tfstring`"""
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(
+        prog='python -m sqlbind_t.tfstring',
+        description='Writes bytecode of modules transformed with prefixed f-strings.',
+    )
+    parser.add_argument('paths', nargs='+', metavar='PATH', help='package dirs or files')
+    parser.add_argument('-s', '--sigil', default='@', help='f-string prefix (default: @)')
+    parser.add_argument(
+        '-j', '--workers', type=int, default=0, help='number of processes (default: cpu count)'
+    )
+    parser.add_argument(
+        '-o',
+        '--optimize',
+        type=int,
+        action='append',
+        dest='levels',
+        help='optimization level, could be repeated (default: interpreter level)',
+    )
+    parser.add_argument(
+        '--verify', action='store_true', help='only report modules with stale bytecode'
+    )
+    args = parser.parse_args(argv)
+
+    levels: List[int] = args.levels or [-1]
+    sources = list(iter_sources(args.paths))
+    if args.verify:
+        stale = [it for it in sources if any(is_stale(it, args.sigil, level) for level in levels)]
+        for it in stale:
+            print(f'stale: {it}')
+        return 1 if stale else 0
+
+    tasks = [(it, args.sigil, level) for it in sources for level in levels]
+    workers = args.workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        results = [precompile(*it) for it in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(precompile, *zip(*tasks)))
+
+    errors = [(path, error) for path, error in results if error]
+    for path, error in errors:
+        print(f'error: {path}: {error}', file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import sqlite3
+from array import array
+from datetime import date
+from types import SimpleNamespace
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pytest
+
+from sqlbind_t import IN, SQL, VALUES, E, compile, postgres, sqlite
+from sqlbind_t.arrays import as_list
+from sqlbind_t.bulk import insert_chunks, insert_many
+from sqlbind_t.dialect import render
+from sqlbind_t.query_params import DollarQueryParams
+from sqlbind_t.sqlite import sqlite_value_list
+
+sdialect = sqlite.Dialect()
+sdialect.IN_MAX_VALUES = 3
+
+
+def test_IN() -> None:
+    assert render(E.a.IN(array('q', [1, 2]))) == ('a IN ?', [[1, 2]])
+    assert render(E.a.IN(memoryview(array('d', [1.5])))) == ('a IN ?', [[1.5]])
+    assert render(E.a.IN(array('q'))) == ('FALSE', [])
+    assert render(E.a.NOT_IN(memoryview(b''))) == ('TRUE', [])
+
+    with pytest.raises(ValueError, match='one-dimensional'):
+        IN(E.a, memoryview(bytes(4)).cast('B', (2, 2)))
+    assert render(E.a.IN(memoryview(array('q', [1])).cast('B').cast('P'))) == ('a IN ?', [[1]])
+
+    assert postgres.Dialect().render(E.a.IN(array('i', [1])), DollarQueryParams()) == (
+        'a = ANY($1)',
+        [[1]],
+    )
+
+    plan = compile(lambda ids: E.a.IN(ids), sdialect)
+    assert plan.bind(array('q', [1, 2])) == ('a IN (?, ?)', [1, 2])
+
+    # values are copied, later changes of a buffer don't leak into a query
+    ids = array('q', [1, 2])
+    buf = bytearray(b'\x01\x02')
+    q = SQL(*E.a.IN(ids), ' AND ', *E.b.IN(memoryview(buf)))
+    ids[0] = 10
+    buf[0] = 10
+    assert render(q) == ('a IN ? AND b IN ?', [[1, 2], [1, 2]])
+
+
+def test_sqlite_IN() -> None:
+    q = E.a.IN(array('q', range(5)))
+    assert sdialect.render(q) == ('a IN (0,1,2,3,4)', [])
+    assert sdialect.render(E.a.IN(array('H', [1, 2]))) == ('a IN (?, ?)', [1, 2])
+
+    assert sqlite_value_list(array('d', [1.5, 2.0])) == '1.5,2.0'
+    assert sqlite_value_list(memoryview(bytes([1, 0])).cast('?')) == '1,0'
+    assert sqlite_value_list(memoryview(b'ab').cast('c')) == "X'61',X'62'"  # type: ignore[arg-type]
+
+    jdialect = sqlite.Dialect()
+    jdialect.IN_STRATEGY = 'json'
+    assert jdialect.render(E.a.IN(array('q', [1, 2]))) == (
+        'a IN (SELECT value FROM json_each(?))',
+        ['[1, 2]'],
+    )
+
+    q = SQL('SELECT ', *E('3').IN(array('q', range(5))))
+    assert sqlite3.connect(':memory:').execute(*sdialect.render(q)).fetchall() == [(1,)]
+
+
+def test_as_list() -> None:
+    values = [1, 2]
+    assert as_list(values) is values
+    assert as_list((1, 2)) == [1, 2]
+    assert as_list(array('q', [1])) == [1]
+
+
+def test_values() -> None:
+    with pytest.raises(ValueError, match='structured array'):
+        VALUES(array('q', [1]))
+
+
+def test_bulk() -> None:
+    rows = memoryview(array('q', range(6))).cast('B').cast('q', (3, 2))
+    sql, params = insert_many('t', rows, ['a', 'b'])  # type: ignore[arg-type]
+    assert sql == 'INSERT INTO t (a, b) VALUES (?, ?)'
+    assert list(params) == [[0, 1], [2, 3], [4, 5]]
+
+    chunks = insert_chunks('t', rows, ['a', 'b'], max_params=4)  # type: ignore[arg-type]
+    assert [it[1] for it in chunks] == [[0, 1, 2, 3], [4, 5]]
+
+    with pytest.raises(ValueError, match='columns are required'):
+        insert_many('t', rows)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match='two-dimensional or structured'):
+        insert_many('t', array('q', [1]), ['a'])  # type: ignore[arg-type]
+
+
+class FakeArray:
+    """NumPy-like array, arrays are detected by `dtype` and `tolist`"""
+
+    def __init__(
+        self, data: List[Any], kind: str, names: Optional[Tuple[str, ...]] = None, ndim: int = 1
+    ) -> None:
+        self.data = data
+        self.dtype = SimpleNamespace(kind=kind, names=names)
+        self.ndim = ndim
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self.data
+
+    def tolist(self) -> Any:
+        return [it.tolist() if isinstance(it, FakeArray) else it for it in self.data]
+
+
+class FakeRecord(Tuple[Any, ...]):
+    def tolist(self) -> Tuple[Any, ...]:
+        return tuple(self)
+
+
+def test_array_protocol() -> None:
+    ids = FakeArray([1, 2], 'i')
+    assert sqlite_value_list(ids) == '1,2'
+    assert sqlite_value_list(FakeArray([0.5], 'f')) == '0.5'
+    assert render(E.a.IN(ids)) == ('a IN ?', [[1, 2]])
+
+    # object arrays (pandas string Series) are checked value by value
+    names = FakeArray(['a', None], 'O')
+    assert render(E.a.IN(names)) == ('a IN ?', [['a', None]])
+    assert sqlite_value_list(names) == "'a',NULL"
+    assert sdialect.render(E.a.IN(FakeArray(['a', 'b', 'c', 'd'], 'O'))) == (
+        "a IN ('a','b','c','d')",
+        [],
+    )
+    with pytest.raises(ValueError, match='Invalid type'):
+        sqlite_value_list(FakeArray([object()], 'O'))
+
+    data = FakeArray([FakeRecord((1, 'a')), FakeRecord((2, 'b'))], 'V', ('id', 'name'))
+    assert render(VALUES(data)) == ('(id, name) VALUES (?, ?), (?, ?)', [1, 'a', 2, 'b'])
+    with pytest.raises(ValueError, match='structured array'):
+        VALUES(ids)
+
+    matrix = FakeArray([FakeArray([0, 1], 'i'), FakeArray([2, 3], 'i')], 'i', ndim=2)
+    sql, params = insert_many('t', matrix, ['a', 'b'])
+    assert list(params) == [[0, 1], [2, 3]]
+
+
+def test_numpy() -> None:
+    np = pytest.importorskip('numpy')
+
+    ids = np.arange(5, dtype=np.int64)
+    assert render(E.a.IN(ids[:2])) == ('a IN ?', [[0, 1]])
+    (values,) = render(E.a.IN(ids))[1]
+    assert type(values[0]) is int  # type: ignore[index]
+    assert sdialect.render(E.a.IN(ids)) == ('a IN (0,1,2,3,4)', [])
+    assert sdialect.render(E.a.IN(np.array([True, False, True, True]))) == ('a IN (1,0,1,1)', [])
+    assert sdialect.render(E.a.IN(np.array([0.5, 1.0]))) == ('a IN (?, ?)', [0.5, 1.0])
+
+    dates = np.array(['2020-01-01'], dtype='datetime64[D]')
+    assert render(E.a.IN(dates)) == ('a IN ?', [[date(2020, 1, 1)]])
+    assert render(E.a.IN(np.array(['x', None], dtype=object))) == ('a IN ?', [['x', None]])
+    with pytest.raises(ValueError, match='one-dimensional'):
+        IN(E.a, np.zeros((2, 2)))
+
+    data = np.array([(1, 'a'), (2, 'b')], dtype=[('id', 'i8'), ('name', 'U5')])
+    assert render(VALUES(data)) == ('(id, name) VALUES (?, ?), (?, ?)', [1, 'a', 2, 'b'])
+
+    sql, params = insert_many('t', data)
+    assert sql == 'INSERT INTO t (id, name) VALUES (?, ?)'
+    assert [list(it) for it in params] == [[1, 'a'], [2, 'b']]
+
+    sql, params = insert_many('t', np.arange(4).reshape(2, 2), ['a', 'b'])
+    assert list(params) == [[0, 1], [2, 3]]
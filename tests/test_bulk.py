@@ -0,0 +1,99 @@
+import sqlite3
+from functools import partial
+from typing import Dict, Iterator
+
+import pytest
+
+from sqlbind_t import sqlite
+from sqlbind_t.bulk import insert_chunks, insert_many
+from sqlbind_t.query_params import NamedQueryParams, NumericQueryParams, PyFormatQueryParams
+
+
+def test_insert_many() -> None:
+    def rows() -> Iterator[Dict[str, object]]:
+        for it in range(3):
+            yield {'id': it, 'name': f'n{it}'}
+
+    sql, params = insert_many('users', rows())
+    assert sql == 'INSERT INTO users (id, name) VALUES (?, ?)'
+
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE users (id, name)')
+    conn.executemany(sql, params)
+    assert conn.execute('SELECT * FROM users').fetchall() == [(0, 'n0'), (1, 'n1'), (2, 'n2')]
+
+
+def test_insert_many_styles() -> None:
+    sql, params = insert_many('t', [(1, 2), (3, 4)], ['a', 'b'], params=NamedQueryParams)
+    assert sql == 'INSERT INTO t (a, b) VALUES (:p0, :p1)'
+    assert list(params) == [{'p0': 1, 'p1': 2}, {'p0': 3, 'p1': 4}]
+
+    sql, pparams = insert_many('t', [{'b': 2, 'a': 1}], ['a', 'b'], params=PyFormatQueryParams)
+    assert sql == 'INSERT INTO t (a, b) VALUES (%(p0)s, %(p1)s)'
+    assert list(pparams) == [{'p0': 1, 'p1': 2}]
+
+    # dedup would merge equal values of a row into one parameter
+    sql, nparams = insert_many(
+        't', [(1, 1), (1, 2)], ['a', 'b'], params=lambda: NumericQueryParams(dedup='equality')
+    )
+    assert sql == 'INSERT INTO t (a, b) VALUES (:1, :2)'
+    assert list(nparams) == [[1, 1], [1, 2]]
+
+
+def test_insert_many_empty() -> None:
+    sql, params = insert_many('t', [], ['a'])
+    assert sql == 'INSERT INTO t (a) VALUES (?)'
+    assert list(params) == []
+
+    with pytest.raises(ValueError, match='columns are required'):
+        insert_many('t', [])
+
+    with pytest.raises(ValueError, match='columns are required'):
+        insert_many('t', [(1, 2)])
+
+
+def test_insert_chunks() -> None:
+    rows = ({'id': it, 'name': f'n{it}'} for it in range(5))
+    chunks = list(insert_chunks('users', rows, max_params=5))
+    assert chunks == [
+        ('INSERT INTO users (id, name) VALUES (?, ?), (?, ?)', [0, 'n0', 1, 'n1']),
+        ('INSERT INTO users (id, name) VALUES (?, ?), (?, ?)', [2, 'n2', 3, 'n3']),
+        ('INSERT INTO users (id, name) VALUES (?, ?)', [4, 'n4']),
+    ]
+    assert chunks[0][0] is chunks[1][0]
+
+    nchunks = list(insert_chunks('t', [(1, 2)], ['a', 'b'], params=NumericQueryParams))
+    assert nchunks == [('INSERT INTO t (a, b) VALUES (:1, :2)', [1, 2])]
+
+    # full chunks share SQL text with deduplicating params too
+    dedup = partial(NumericQueryParams, dedup='equality')
+    rows2 = [(1, 1), (2, 3), (4, 4), (5, 6)]
+    dchunks = list(insert_chunks('t', rows2, ['a', 'b'], params=dedup, max_params=4))
+    assert dchunks[0] == ('INSERT INTO t (a, b) VALUES (:1, :2), (:3, :4)', [1, 1, 2, 3])
+    assert dchunks[0][0] is dchunks[1][0]
+
+    assert list(insert_chunks('t', [], ['a'])) == []
+
+    with pytest.raises(ValueError, match='exceed parameter limit'):
+        list(insert_chunks('t', [(1, 2)], ['a', 'b'], max_params=1))
+
+    # short row would shift values of the next one
+    with pytest.raises(ValueError, match='Row has 1 values, expected 2'):
+        list(insert_chunks('t', [(1, 2), (3,), (4, 5)], ['a', 'b']))
+    with pytest.raises(ValueError, match='Row has 3 values'):
+        list(insert_many('t', [(1, 2, 3)], ['a', 'b'])[1])
+
+
+def test_insert_chunks_sqlite_limit() -> None:
+    dialect = sqlite.Dialect()
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE t (a, b, c)')
+    total = dialect.MAX_PARAMS + 10
+    rows = ((it, it, it) for it in range(total))
+    chunks = insert_chunks('t', rows, ['a', 'b', 'c'], dialect=dialect)
+    statements = set()
+    for sql, params in chunks:
+        conn.execute(sql, params)
+        statements.add(sql)
+    assert len(statements) == 2
+    assert conn.execute('SELECT count(*) FROM t').fetchone() == (total,)
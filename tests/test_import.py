@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+import sqlbind_t
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(sqlbind_t.__file__)))
+
+#: Modules which must not be loaded by plain `import sqlbind_t`
+LAZY_MODULES = {
+    'sqlbind_t.tfstring',
+    'sqlbind_t.plan',
+    'ast',
+    'inspect',
+    'importlib.abc',
+    'concurrent.futures',
+    'decimal',
+    'sqlbind_t.keyset',
+    'sqlbind_t.profile',
+    'uuid',
+}
+
+
+def import_times(code: str) -> Dict[str, int]:
+    """Returns cumulative import time in microseconds for each imported module
+
+    Interpreter is isolated from environment, user site and site hooks
+    (.pth files), so only modules imported by the code are reported.
+    """
+    code = f'import sys; sys.path.insert(0, {ROOT!r}); {code}'
+    proc = subprocess.run(
+        [sys.executable, '-I', '-S', '-X', 'importtime', '-c', code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    result = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:') :].split('|')
+        if cumulative.strip().isdigit():
+            result[name.strip()] = int(cumulative)
+    return result
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='no -X importtime')
+def test_import_time() -> None:
+    times = import_times('import sqlbind_t')
+    assert 'sqlbind_t' in times
+    assert not LAZY_MODULES & set(times)
+
+    times = import_times('import sqlbind_t.tfstring')
+    assert 'sqlbind_t.tfstring' in times
+    assert 'concurrent.futures' not in times
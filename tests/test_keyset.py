@@ -0,0 +1,164 @@
+import base64
+import sqlite3
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, List, Sequence
+from uuid import UUID
+
+import pytest
+
+from sqlbind_t import EMPTY, SQL, WHERE, E, postgres, sqlf, sqlite
+from sqlbind_t.dialect import Dialect
+from sqlbind_t.keyset import Keyset, decode_cursor, encode_cursor, scan
+from sqlbind_t.query_params import NamedQueryParams, NumericQueryParams, QMarkQueryParams
+
+dialect = sqlite.Dialect()
+
+
+def make_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE items (id, created, name)')
+    conn.executemany(
+        'INSERT INTO items VALUES (?, ?, ?)', [(it, it // 3, f'n{it}') for it in range(25)]
+    )
+    return conn
+
+
+def test_seek() -> None:
+    items = Keyset(E.items.created, E.items.id, limit=10)
+    q = items.seek([1, 2])
+    assert dialect.render(q) == ('(items.created, items.id) > (?, ?)', [1, 2])
+    assert Dialect().render(q) == (
+        '(items.created > ? OR (items.created = ? AND items.id > ?))',
+        [1, 1, 2],
+    )
+    assert Dialect().render(q, NumericQueryParams(dedup='identity')) == (
+        '(items.created > :1 OR (items.created = :1 AND items.id > :2))',
+        [1, 2],
+    )
+    assert postgres.Dialect().render(q, NamedQueryParams()) == (
+        '(items.created, items.id) > (:p0, :p1)',
+        {'p0': 1, 'p1': 2},
+    )
+
+    mixed = Keyset(E.created, E.id, limit=10, desc=[True, False])
+    assert dialect.render(mixed.seek([1, 2])) == (
+        '(created < ? OR (created = ? AND id > ?))',
+        [1, 1, 2],
+    )
+    assert mixed.order_limit._parts == ('ORDER BY created DESC, id LIMIT 10',)
+
+    single = Keyset(E.id, limit=5, desc=True)
+    assert dialect.render(single.seek([3])) == ('id < ?', [3])
+    assert single.after(None) is EMPTY
+
+    with pytest.raises(ValueError, match='columns are required'):
+        Keyset(limit=1)
+    with pytest.raises(ValueError, match='for each column'):
+        Keyset(E.a, E.b, limit=1, desc=[True])
+
+
+def page_query(items: Keyset, after: SQL) -> SQL:
+    return sqlf(
+        f'@SELECT id, created, name FROM items {WHERE(E.id != 7, after)} {items.order_limit}'
+    )
+
+
+@pytest.mark.parametrize('desc', [False, True])
+def test_pages(desc: bool) -> None:
+    conn = make_db()
+    conn.row_factory = sqlite3.Row
+    items = Keyset(E.created, E.id, limit=10, desc=desc)
+
+    result: List[int] = []
+    cursor = None
+    pages = 0
+    while True:
+        rows = conn.execute(*dialect.render(page_query(items, items.after(cursor)))).fetchall()
+        result.extend(it['id'] for it in rows)
+        pages += 1
+        cursor = items.next_cursor(rows)
+        if cursor is None:
+            break
+
+    expected = [it for it in range(25) if it != 7]
+    assert result == (expected[::-1] if desc else expected)
+    assert pages == 3
+
+
+def test_scan() -> None:
+    conn = make_db()
+    items = Keyset(E.created, E.id, limit=6)
+    rows = list(scan(conn, items, lambda after: page_query(items, after), dialect=Dialect()))
+    assert [it[0] for it in rows] == [it for it in range(25) if it != 7]
+
+    # exact multiple of a limit fetches an empty last page
+    items = Keyset(E.id, limit=8, key=lambda row: [row[0]])
+    rows = list(scan(conn, items, lambda after: page_query(items, after), dialect=dialect))
+    assert len(rows) == 24
+
+    bad = Keyset(E.created, limit=1)
+    with pytest.raises(ValueError, match='ordering columns'):
+        list(scan(conn, bad, lambda after: sqlf(f'@SELECT id FROM items {bad.order_limit}')))
+
+
+def test_scan_params() -> None:
+    conn = make_db()
+    items = Keyset(E.created, E.id, limit=10)
+
+    def query(after: SQL) -> SQL:
+        return page_query(items, after)
+
+    rows = list(scan(conn, items, query, dialect=dialect, params=NamedQueryParams))
+    assert len(rows) == 24
+    rows = list(scan(conn, items, query, params=QMarkQueryParams))
+    assert len(rows) == 24
+
+
+def test_cursor() -> None:
+    values: Sequence[Any] = [
+        None,
+        True,
+        1,
+        1.5,
+        's',
+        datetime(2020, 1, 2, 3, 4, 5, 6),
+        datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=3))),
+        date(2020, 1, 2),
+        time(3, 4, 5, 6),
+        Decimal('1.10'),
+        UUID(int=1),
+        b'\x00\xff',
+    ]
+    cursor = encode_cursor(values)
+    assert '=' not in cursor and '/' not in cursor
+    assert decode_cursor(cursor) == values
+
+    items = Keyset(E.a, E.b, limit=2)
+    assert items.cursor({'a': 1, 'b': 2}) == encode_cursor([1, 2])
+    assert items.next_cursor([{'a': 1, 'b': 2}]) is None
+    with pytest.raises(ValueError, match='key is required'):
+        items.cursor((1, 2))
+
+    tuples = Keyset(E.a, E.b, limit=1, key=lambda row: row[1:])
+    assert tuples.next_cursor([(0, 1, 2)]) == encode_cursor([1, 2])
+
+    with pytest.raises(ValueError, match='Invalid type'):
+        encode_cursor([object()])
+    invalid = [
+        b'{}',
+        b'[{"t":"Decimal","v":"x"}]',
+        b'[{"t":"x","v":"1"}]',
+        b'[{"v":1}]',
+        b'[[1]]',
+        b'[{"t":"UUID","v":5}]',
+        b'[{"t":"bytes","v":null}]',
+        b'[{"t":"date","v":"x"}]',
+        b'[{"t":"time","v":3}]',
+        b'[{"t":"datetime","v":[2020,1,"2"],"tz":null}]',
+        b'[' * 100000,
+    ]
+    cursors = ['!', encode_cursor([1])] + [base64.urlsafe_b64encode(it).decode() for it in invalid]
+    for it in cursors:
+        with pytest.raises(ValueError, match='Invalid cursor'):
+            items.after(it)
@@ -0,0 +1,116 @@
+import sqlite3
+from array import array
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from enum import IntEnum
+from uuid import UUID
+
+import pytest
+
+from sqlbind_t import E, postgres, sqlite
+from sqlbind_t.dialect import Dialect
+from sqlbind_t.literals import Literals
+from sqlbind_t.sqlite import sqlite_escape
+
+UID = UUID(int=1)
+DT = datetime(2020, 1, 2, 3, 4, 5)
+
+
+class Color(IntEnum):
+    RED = 1
+
+
+def test_literal() -> None:
+    literal = Dialect().literal
+    assert literal(None) == 'NULL'
+    assert literal(True) == 'TRUE'
+    assert literal(Color.RED) == '1'
+    assert literal(1.5) == '1.5'
+    assert literal("it's") == "'it''s'"
+    assert literal(bytearray(b'\x00\xff')) == "X'00ff'"
+    assert literal(DT) == "TIMESTAMP '2020-01-02 03:04:05'"
+    assert literal(DT.replace(tzinfo=timezone.utc)) == (
+        "TIMESTAMP WITH TIME ZONE '2020-01-02 03:04:05+00:00'"
+    )
+    assert literal(date(2020, 1, 2)) == "DATE '2020-01-02'"
+    assert literal(time(3, 4)) == "TIME '03:04:00'"
+    assert literal(Decimal('1.10')) == '1.10'
+    assert literal(UID) == "'00000000-0000-0000-0000-000000000001'"
+
+    with pytest.raises(ValueError, match='Invalid value: nan'):
+        literal(float('nan'))
+    with pytest.raises(ValueError, match='Invalid value: inf'):
+        literal(Decimal('Infinity'))
+    with pytest.raises(ValueError, match='Invalid type'):
+        literal({})
+
+
+def test_literal_list() -> None:
+    literals = Literals()
+    assert literals.literal_list([1, 2]) == '1,2'
+    assert literals.literal_list([1.5, 2.0]) == '1.5,2.0'
+    assert literals.literal_list(['a', 'b']) == "'a','b'"
+    assert literals.literal_list(["a'", 'b']) == "'a''','b'"
+    assert literals.literal_list([True, False]) == 'TRUE,FALSE'
+    assert literals.literal_list([1, None, 'a']) == "1,NULL,'a'"
+    assert literals.literal_list([Color.RED, Color.RED]) == '1,1'
+
+    # lists respect overridden formatters
+    class Custom(Literals):
+        def format_int(self, value: int) -> str:
+            return f'CAST({super().format_int(value)} AS BIGINT)'
+
+        def format_float(self, value: float) -> str:
+            return f'{value:.1f}'
+
+        def format_str(self, value: str) -> str:
+            return 'N' + super().format_str(value)
+
+        def format_bool(self, value: bool) -> str:
+            return '1' if value else '0'
+
+    custom = Custom()
+    assert custom.literal(Color.RED) == 'CAST(1 AS BIGINT)'
+    assert custom.literal_list([1, 2]) == 'CAST(1 AS BIGINT),CAST(2 AS BIGINT)'
+    assert custom.literal_list(array('q', [3])) == 'CAST(3 AS BIGINT)'
+    assert custom.literal_list([0.25]) == '0.2'
+    assert custom.literal_list(['a']) == "N'a'"
+    assert custom.literal_list([True, False]) == '1,0'
+    assert custom.literal_list(memoryview(bytes([1, 0])).cast('?')) == '1,0'
+
+    with pytest.raises(ValueError, match='Invalid value'):
+        literals.literal_list([1.0, float('inf')])
+    with pytest.raises(ValueError, match='Invalid type'):
+        literals.literal_list([{}, {}])
+
+
+def test_sqlite() -> None:
+    literal = sqlite.Dialect().literal
+    assert literal(True) == '1'
+    assert literal(float('nan')) == 'NULL'
+    assert literal(DT) == "'2020-01-02 03:04:05'"
+    assert literal(date(2020, 1, 2)) == "'2020-01-02'"
+    assert literal(time(3, 4)) == "'03:04:00'"
+    assert sqlite_escape(1) == '1'
+
+    values = [None, True, 1, 1.5, float('inf'), "it's", b'\x00\xff', DT, Decimal('2.5'), UID]
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE t (value)')
+    conn.executemany('INSERT INTO t VALUES (?)', [(str(it),) for it in values[5:]])
+    expected = [None, 1, 1, 1.5, float('inf'), "it's", b'\x00\xff', str(DT), 2.5, str(UID)]
+    row = conn.execute(f'SELECT {sqlite.LITERALS.literal_list(values)}').fetchone()
+    assert list(row) == expected
+
+    q = sqlite.Dialect().render(E('value').IN([str(DT)] * 20 + [str(UID)]))
+    assert conn.execute(f'SELECT count(*) FROM t WHERE {q[0]}').fetchone() == (2,)
+
+
+def test_postgres() -> None:
+    literal = postgres.Dialect().literal
+    assert literal(False) == 'FALSE'
+    assert literal(b'\x00\xff') == "'\\x00ff'::bytea"
+    assert literal(float('nan')) == "'NaN'::float8"
+    assert literal(float('-inf')) == "'-Infinity'::float8"
+    assert literal(Decimal('1.5')) == '1.5'
+    assert literal(Decimal('Infinity')) == "'Infinity'::numeric"
+    assert literal(UID) == "'00000000-0000-0000-0000-000000000001'::uuid"
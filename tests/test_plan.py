@@ -0,0 +1,107 @@
+import pytest
+
+from sqlbind_t import IN, WHERE, E, Slot, compile, freeze, not_none, sqlf, sqlite, truthy
+from sqlbind_t.keyset import Keyset
+from sqlbind_t.query_params import NamedQueryParams, NumericQueryParams
+
+
+def test_simple() -> None:
+    plan = compile(lambda a, b: sqlf(f'@SELECT {a}, {b}, {10}, {a}'))
+    assert not plan.dynamic
+    assert plan.sql == 'SELECT ?, ?, ?, ?'
+    assert plan.bind(1, 2) == ('SELECT ?, ?, ?, ?', [1, 2, 10, 1])
+
+    with pytest.raises(TypeError, match='takes 2 arguments'):
+        plan.bind(1)
+
+
+def test_param_styles() -> None:
+    plan = compile(lambda a, b: WHERE(E.a == a, b=not_none / b), None, NumericQueryParams)
+    assert plan.bind(1, 2) == ('WHERE a = :1 AND b = :2', [1, 2])
+
+    nplan = compile(lambda a: sqlf(f'@SELECT {a}'), None, NamedQueryParams)
+    assert nplan.bind(1) == ('SELECT :p0', {'p0': 1})
+
+
+def test_dynamic() -> None:
+    dialect = sqlite.Dialect()
+    dialect.IN_MAX_VALUES = 2
+
+    plan = compile(lambda a, b: WHERE(E.a == a, IN(E.b, b), E.c.LIKE('{}%', a)), dialect)
+    assert plan.dynamic
+    assert plan.sql is None
+    assert plan.bind('x_y', [1, 2]) == (
+        'WHERE a = ? AND b IN (?, ?) AND c LIKE ?',
+        ['x_y', 1, 2, 'x\\_y%'],
+    )
+    assert plan.bind('z', [1, 2, 3]) == ('WHERE a = ? AND b IN (1,2,3) AND c LIKE ?', ['z', 'z%'])
+
+    nplan = compile(lambda b: E.b.IN(b), None, NumericQueryParams)
+    assert nplan.bind([1, 2]) == ('b IN :1', [[1, 2]])
+    assert nplan.bind_tuple([1, 2]) == ('b IN :1', ([1, 2],))
+
+
+def test_bind_tuple() -> None:
+    plan = compile(lambda a, b: sqlf(f'@SELECT {a}, {b}'))
+    args = (1, 2)
+    assert plan.bind_tuple(*args) == ('SELECT ?, ?', (1, 2))
+
+    nplan = compile(lambda a: sqlf(f'@SELECT {a}, {10}'), None, NumericQueryParams)
+    assert nplan.bind_tuple(1) == ('SELECT :1, :2', (1, 10))
+    with pytest.raises(TypeError, match='takes 1 arguments'):
+        nplan.bind_tuple()
+
+    with pytest.raises(TypeError, match='positional parameter style'):
+        compile(lambda a: sqlf(f'@SELECT {a}'), None, NamedQueryParams).bind_tuple(1)
+
+
+def test_nested_slots() -> None:
+    plan = compile(lambda a, b: IN(sqlf(f'@coalesce(x, {a})'), [b, 10]))
+    assert plan.dynamic
+    assert plan.bind(0, 5) == ('coalesce(x, ?) IN ?', [0, [5, 10]])
+    assert plan.bind(1, 6) == ('coalesce(x, ?) IN ?', [1, [6, 10]])
+
+    items = Keyset(E.a, E.b, limit=10)
+    splan = compile(lambda a, b: items.seek([a, b]), sqlite.Dialect())
+    assert splan.bind(1, 2) == ('(a, b) > (?, ?)', [1, 2])
+
+    with pytest.raises(ValueError, match='Frozen'):
+        compile(lambda a: WHERE(freeze(E.a == a)))
+    fplan = compile(lambda a: WHERE(freeze(E.a == 1), E.b.IN([a])))
+    assert fplan.bind(2) == ('WHERE a = ? AND b IN ?', [1, [2]])
+    one = freeze(sqlf(f'@{1}'))
+    fplan = compile(lambda a: IN(sqlf(f'@coalesce(x, {one}, {a})'), [a]))
+    assert fplan.bind(2) == ('coalesce(x, ?, ?) IN ?', [1, 2, [2]])
+
+
+def test_none() -> None:
+    plan = compile(lambda a, b: WHERE(E.a == a, E.b != b, c=a))
+    assert plan.sql == 'WHERE a = ? AND b != ? AND c = ?'
+    assert plan.bind(1, 2) == ('WHERE a = ? AND b != ? AND c = ?', [1, 2, 1])
+    assert plan.bind(None, 2) == ('WHERE a IS NULL AND b != ? AND c IS NULL', [2])
+    assert plan.bind(1, None) == ('WHERE a = ? AND b IS NOT NULL AND c = ?', [1, 1])
+    assert plan.bind_tuple(None, None) == ('WHERE a IS NULL AND b IS NOT NULL AND c IS NULL', ())
+    assert plan.bind_tuple(1, 2) == ('WHERE a = ? AND b != ? AND c = ?', (1, 2, 1))
+    assert plan.bind_params(1, 2) == [1, 2, 1]
+    with pytest.raises(ValueError, match='None arguments'):
+        plan.bind_params(None, 2)
+
+    assert repr(Slot(0, 'a')) == 'Slot(a)'
+
+    # other comparisons bind None as is
+    assert compile(lambda a: E.a > a).bind(None) == ('a > ?', [None])
+
+
+def test_conditional() -> None:
+    plan = compile(lambda x: WHERE(E.b == 1, a=truthy / x))
+    assert plan.conditional
+    assert plan.sql is None
+    assert plan.bind(0) == ('WHERE b = ?', [1])
+    assert plan.bind(2) == ('WHERE b = ? AND a = ?', [1, 2])
+    assert plan.bind_params(0) == [1]
+    assert plan.bind_tuple(2) == ('WHERE b = ? AND a = ?', (1, 2))
+
+    # conditional and dynamic plans are rendered for params too
+    dplan = compile(lambda a, b: WHERE(E.a == a, E.b.IN(b), c=not_none / a))
+    assert dplan.bind_params(None, [1, 2]) == [[1, 2]]
+    assert dplan.bind_params('z', [1, 2]) == ['z', [1, 2], 'z']
@@ -0,0 +1,25 @@
+from sqlbind_t import NOT_IN, E, compile, postgres, sqlf
+from sqlbind_t.query_params import DollarQueryParams, FormatQueryParams
+
+dialect = postgres.Dialect()
+
+
+def test_IN() -> None:
+    val = E.val
+    assert dialect.render(val.IN([1, 2]), FormatQueryParams()) == ('val = ANY(%s)', [[1, 2]])
+    assert dialect.render(val.IN([]), DollarQueryParams()) == ('val = ANY($1)', [[]])
+    assert dialect.render(val.NOT_IN((1, 2)), DollarQueryParams()) == ('val <> ALL($1)', [[1, 2]])
+    assert dialect.render(NOT_IN(sqlf(f'@f + {1}'), [2]), DollarQueryParams()) == (
+        'f + $1 <> ALL($2)',
+        [1, [2]],
+    )
+
+
+def test_IN_plan() -> None:
+    plan = compile(lambda ids: sqlf(f'@SELECT * FROM t WHERE {E.id.IN(ids)}'), dialect)
+    assert plan.bind([1, 2]) == ('SELECT * FROM t WHERE id = ANY(?)', [[1, 2]])
+    assert plan.bind([1, 2, 3]) == ('SELECT * FROM t WHERE id = ANY(?)', [[1, 2, 3]])
+
+
+def test_native_ops() -> None:
+    assert dialect.render(E.tag.ILIKE('{}%', 'a_b')) == ('tag ILIKE ?', ['a\\_b%'])
@@ -1,6 +1,14 @@
+from decimal import Decimal
+from functools import partial
+from typing import List, Optional, Tuple
+
+import pytest
+
 import sqlbind_t.query_params as qp
-from sqlbind_t import sqlf
-from sqlbind_t.dialect import render
+from sqlbind_t import EMPTY, SQL, WHERE, E, compile, not_none, sqlf, truthy
+from sqlbind_t.dialect import Dialect, render
+
+render_tuple = Dialect().render_tuple
 
 
 def test_query_params() -> None:
@@ -13,3 +21,135 @@ def test_query_params() -> None:
 
     assert render(q, qp.NamedQueryParams()) == ('SELECT :p0, :p1', {'p0': 10, 'p1': 20})
     assert render(q, qp.PyFormatQueryParams()) == ('SELECT %(p0)s, %(p1)s', {'p0': 10, 'p1': 20})
+
+
+def test_placeholders() -> None:
+    q = sqlf(f'@SELECT {10}')
+    assert render(q, qp.DollarQueryParams()) == ('SELECT $1', [10])
+    assert qp.DOLLAR[1] == '$1'
+
+    params = qp.NumericQueryParams()
+    params.reserve(3)
+    assert 3 in qp.NUMERIC
+    assert render(q, params) == ('SELECT :1', [10])
+
+    nparams = qp.NamedQueryParams()
+    nparams.reserve(3)
+    assert 2 in qp.NAMED
+    assert nparams.add(5) == 'p0'
+    assert render(q, nparams) == ('SELECT :p1', {'p0': 5, 'p1': 10})
+
+    qparams = qp.QMarkQueryParams()
+    qparams.reserve(2)
+    qparams.extend_values([1, 2])
+    assert qparams == [1, 2]
+
+    marks = qp.Placeholders('${}', limit=2)
+    marks.reserve(5)
+    assert marks == {0: '$0', 1: '$1'}
+    assert marks[10] == '$10'
+    assert len(marks) == 2
+
+
+def test_render_tuple() -> None:
+    q = sqlf(f'@SELECT {10}, {20}')
+    assert render_tuple(q) == ('SELECT ?, ?', (10, 20))
+    assert render_tuple(q, qp.DollarQueryParams()) == ('SELECT $1, $2', (10, 20))
+
+
+def test_dedup() -> None:
+    tenant = ['t1']
+    q = sqlf(f'@SELECT {tenant}, {1}, {tenant}, {True}, {1}, {["t1"]}')
+
+    assert render(q, qp.NumericQueryParams(dedup='identity')) == (
+        'SELECT :1, :2, :1, :3, :2, :4',
+        [tenant, 1, True, ['t1']],
+    )
+    assert render(q, qp.DollarQueryParams(dedup='equality')) == (
+        'SELECT $1, $2, $1, $3, $2, $4',
+        [tenant, 1, True, ['t1']],
+    )
+    assert render(q, qp.NamedQueryParams(dedup='equality')) == (
+        'SELECT :p0, :p1, :p0, :p2, :p1, :p3',
+        {'p0': tenant, 'p1': 1, 'p2': True, 'p3': ['t1']},
+    )
+    assert render(sqlf(f'@{"a"}, {"a"}'), qp.PyFormatQueryParams(dedup='equality')) == (
+        '%(p0)s, %(p0)s',
+        {'p0': 'a'},
+    )
+
+    values = [Decimal('1'), Decimal('1.00'), (1,), (True,), (1,), 0.0, -0.0, ([1],)]
+    assert render(sqlf(f'@{values[0]}, {values[1]}'), qp.NumericQueryParams(dedup='equality')) == (
+        ':1, :2',
+        values[:2],
+    )
+    keys = [qp.dedup_key(it, 'equality') for it in values]
+    assert len(set(keys)) == len(keys) - 1
+    assert keys[2] == keys[4]
+
+    with pytest.raises(ValueError, match='Unknown dedup mode'):
+        qp.NumericQueryParams(dedup='boo')
+
+    with pytest.raises(ValueError, match='Unknown dedup mode'):
+        qp.NamedQueryParams(dedup='boo')
+
+
+def test_dedup_plan() -> None:
+    plan = compile(
+        lambda a, b: sqlf(f'@SELECT {a}, {b}, {a}'),
+        None,
+        lambda: qp.NumericQueryParams(dedup='equality'),
+    )
+    assert plan.sql is None
+    assert plan.bind(1, 2) == ('SELECT :1, :2, :1', [1, 2])
+    assert plan.bind(1, 1) == ('SELECT :1, :1, :1', [1])
+
+    params = qp.NumericQueryParams(dedup='identity')
+    params.extend_values([1, 1])
+    assert params == [1]
+
+
+def test_render_many() -> None:
+    dialect = Dialect()
+
+    def query(uid: int, name: Optional[str]) -> SQL:
+        return WHERE(uid=uid, name=not_none / name)
+
+    assert dialect.render_many(query, []) == []
+    assert dialect.render_many(query, [(1, None), (2, 'a'), (3, None)], qp.NumericQueryParams) == [
+        ('WHERE uid = :1', [[1], [3]]),
+        ('WHERE uid = :1 AND name = :2', [[2, 'a']]),
+    ]
+    assert dialect.render_many(query, [(1, 'a'), (2, 'b')], qp.NamedQueryParams) == [
+        ('WHERE uid = :p0 AND name = :p1', [{'p0': 1, 'p1': 'a'}, {'p0': 2, 'p1': 'b'}]),
+    ]
+
+    rows = [(1, 'a'), (2, 'b'), (1, 1), (3, 'c')]
+    dedup = partial(qp.NumericQueryParams, dedup='equality')
+    assert dialect.render_many(query, rows, dedup) == [
+        ('WHERE uid = :1 AND name = :2', [[1, 'a'], [2, 'b'], [3, 'c']]),
+        ('WHERE uid = :1 AND name = :1', [[1]]),
+    ]
+
+    # builders are called for each row, plans only bind values
+    def by_id(uid: Optional[int], ids: List[int]) -> SQL:
+        return WHERE(E.id == uid, E.parent.IN(ids))
+
+    id_rows: List[Tuple[Optional[int], List[int]]] = [(1, [1]), (None, [2]), (2, [3]), (3, [4, 5])]
+    expected = [
+        ('WHERE id = ? AND parent IN ?', [[1, [1]], [2, [3]], [3, [4, 5]]]),
+        ('WHERE id IS NULL AND parent IN ?', [[[2]]]),
+    ]
+    assert dialect.render_many(by_id, id_rows) == expected
+    assert dialect.render_many(compile(by_id, dialect), id_rows) == expected
+
+    flags = dialect.render_many(lambda a: WHERE(E.b == 1, a=truthy / a), [(0,), (2,)])
+    assert flags == [('WHERE b = ?', [[1]]), ('WHERE b = ? AND a = ?', [[1, 2]])]
+
+    def branchy(x: Optional[int], name: str) -> SQL:
+        return WHERE(E.a == 1, (E.b > x) if x is not None else EMPTY, name=name.lower())
+
+    assert dialect.render_many(branchy, [(None, 'A'), (2, 'B'), (None, 'C')]) == [
+        ('WHERE a = ? AND name = ?', [[1, 'a'], [1, 'c']]),
+        ('WHERE a = ? AND b > ? AND name = ?', [[1, 2, 'b']]),
+    ]
@@ -1,27 +1,48 @@
+import io
 from textwrap import dedent
+from typing import Any, Dict, Iterator, List
 
 import pytest
 
 from sqlbind_t import (
+    AND,
     EMPTY,
     IN,
     SET,
+    SQL,
     UNDEFINED,
     VALUES,
     WHERE,
+    AnySQL,
+    Compound,
     E,
+    Expr,
+    compile,
     cond,
+    declare,
+    freeze,
     in_crange,
     in_range,
+    join_fragments,
     not_none,
     sql,
     sqlf,
+    sqlite,
     sqls,
     text,
     truthy,
 )
-from sqlbind_t.dialect import like_escape, render
-from sqlbind_t.template import HAS_TSTRINGS, Interpolation, Template
+from sqlbind_t.cache import LRUCache
+from sqlbind_t.dialect import Dialect, DialectOp, FrozenOp, like_escape, render
+from sqlbind_t.query_params import NumericQueryParams, QMarkQueryParams, QueryParams
+from sqlbind_t.template import (
+    HAS_TSTRINGS,
+    Interpolation,
+    NInterpolation,
+    NTemplate,
+    Template,
+    parse_cache,
+)
 from sqlbind_t.tfstring import check_template as t
 
 
@@ -140,6 +161,9 @@ def test_in() -> None:
 
     assert render(IN(sqlf(f'@field + {42}'), [10, 20])) == ('field + ? IN ?', [42, [10, 20]])
 
+    assert render(val.NOT_IN([10, 20])) == ('val NOT IN ?', [[10, 20]])
+    assert render(val.NOT_IN([])) == ('TRUE', [])
+
 
 def test_like_escape() -> None:
     assert like_escape('boo') == 'boo'
@@ -161,3 +185,258 @@ def test_cond() -> None:
     is_false = cond(False)
     assert is_true / 10 == 10
     assert is_false / 10 is UNDEFINED
+
+
+def test_shape_slots() -> None:
+    # literal text could contain any character, slots are positions
+    q = WHERE(E.a.IN(['x\x00y'] * 20), E.b == 5)
+    expected = sqlite.Dialect().render(q)
+    assert expected[0].startswith("WHERE a IN ('x\x00y','x\x00y',")
+    assert expected[1] == [5]
+
+    dialect = sqlite.Dialect()
+    assert sqlite.Dialect().render(freeze(q)) == expected
+    plan = compile(lambda b: WHERE(E.a.IN(['x\x00y'] * 20), E.b == b), dialect)
+    assert plan.bind(5) == expected
+
+    structure, values = Dialect().shape(q)
+    assert repr(structure) == "('WHERE ', OP, ' AND ', 'b = ', VALUE)"
+    assert values[1] == 5
+    assert Dialect().shape(sqls('SELECT {E.a}')) == (('SELECT ', 'a'), [])
+
+
+def walk(dialect: Dialect, query: AnySQL, params: QueryParams) -> Iterator[str]:
+    # recursive reference for the stack based Dialect._write
+    for it in query:
+        if type(it) is str:
+            yield it
+        else:
+            value = it.value  # type: ignore[union-attr]
+            if isinstance(value, (Template, SQL)):
+                yield from walk(dialect, value, params)
+            elif isinstance(value, DialectOp):
+                yield value.render(params, dialect)
+            elif isinstance(value, Expr):
+                yield value._left
+            else:
+                yield params.compile(value)
+
+
+def test_write_matches_walk() -> None:
+    dialect = Dialect()
+    q = sqlf(
+        f'@SELECT * FROM {E.t} {WHERE(E.a == 1, E.b.IN([1, 2]) | ~(E.c > 3), d=None)} {SET(e=4)}'
+    )
+    out: List[str] = []
+    dialect._write(q, QMarkQueryParams(), out)
+    assert out == list(walk(dialect, q, QMarkQueryParams()))
+
+
+def test_deep_tree() -> None:
+    q = E.a == 1
+    for _ in range(5000):
+        q = SQL('(', Interpolation(q), ')')
+    s, p = render(q)
+    assert s == '(' * 5000 + 'a = ?' + ')' * 5000
+    assert p == [1]
+
+
+def test_sqls_cache() -> None:
+    parse_cache.clear()
+    for it in range(3):
+        assert render(sqls('SELECT {it}, {it + 1} FROM {E.t}')) == (
+            'SELECT ?, ? FROM t',
+            [it, it + 1],
+        )
+    assert render(sqls('SELECT 1')) == ('SELECT 1', [])
+    assert parse_cache.stats() == {'hits': 2, 'misses': 2, 'size': 2, 'maxsize': 256}
+
+
+def test_lru_cache() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert len(cache) == 2
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 2, 'maxsize': 2}
+
+
+def test_slots() -> None:
+    nodes = [
+        SQL(),
+        WHERE(E.a == 1, E.b == 2),
+        E.a,
+        cond(True),
+        E.a.IN([1]),
+        E.a.LIKE('{}', 'b'),
+        NTemplate(),
+        NInterpolation(1),
+    ]
+    for it in nodes:
+        assert not type(it).__dictoffset__, it
+
+    class MyExpr(Expr):
+        pass
+
+    col = MyExpr().t.col
+    assert type(col) is MyExpr
+    assert render(col == 1) == ('t.col = ?', [1])
+
+
+def test_flatten() -> None:
+    a, b, c, d = E.a == 1, E.b == 2, E.c == 3, E.d == 4
+    q = a & b & c & d
+    assert render(q) == ('(a = ? AND b = ? AND c = ? AND d = ?)', [1, 2, 3, 4])
+    assert render(a | (b | EMPTY) | c) == ('(a = ? OR b = ? OR c = ?)', [1, 2, 3])
+    assert render((a | b) & c) == ('((a = ? OR b = ?) AND c = ?)', [1, 2, 3])
+    assert render(a | (b & c)) == ('(a = ? OR (b = ? AND c = ?))', [1, 2, 3])
+    assert render(WHERE(a & b, c)) == ('WHERE a = ? AND b = ? AND c = ?', [1, 2, 3])
+    assert render(AND(WHERE(a), b)) == ('(WHERE a = ? AND b = ?)', [1, 2])
+
+    # custom wraps are not just grouping
+    neg = join_fragments(' AND ', [a, b], ('NOT (', ')'))
+    assert render(AND(neg, c)) == ('(NOT (a = ? AND b = ?) AND c = ?)', [1, 2, 3])
+    assert render(join_fragments(' AND ', [neg, c], ('NOT (', ')'), flatten=True)) == (
+        'NOT (NOT (a = ? AND b = ?) AND c = ?)',
+        [1, 2, 3],
+    )
+
+    q = EMPTY
+    for it in range(100):
+        q = q & (E.f == it)
+    assert isinstance(q, Compound)
+    assert len(q._tlist) == 100
+
+
+def test_compound_parts_reuse() -> None:
+    q = WHERE(E.a == 1, E.b.IN([2, 3]), c=None)
+    first = list(q)
+    assert all(a is b for a, b in zip(first, q))
+    assert render(q) == render(q) == ('WHERE a = ? AND b IN ? AND c IS NULL', [1, [2, 3]])
+
+
+def test_expr_interning() -> None:
+    assert E.users.id is E.users.id
+    assert E('a + 1') is E('a + 1')
+
+    class MyExpr(Expr):
+        CACHE_SIZE = 3
+
+    M = MyExpr()
+    assert type(M.users.id) is MyExpr
+    assert M.users is not E.users
+    assert M.a is M.a and M.b is M.b
+    assert M.c is not M.c
+    assert M.c._left == 'c'
+
+    users = declare(M.users, 'id', 'name', 'age')
+    assert users is M.users
+    assert users.age is users.age
+    assert render(users.age > 10) == ('users.age > ?', [10])
+    assert declare(M, 'c', 'a').c is M.c
+    assert declare(MyExpr(), 'x').x._left == 'x'
+
+
+def test_freeze() -> None:
+    active = freeze(WHERE(E.deleted_at == None, E.tenant == 5))  # noqa: E711
+    assert freeze(EMPTY) is EMPTY
+    assert freeze(sqlf(f'@a = {not_none / None}')) is EMPTY
+
+    q = sqlf(f'@SELECT * FROM t {active} AND id = {10}')
+    s, p = render(q)
+    assert s == 'SELECT * FROM t WHERE deleted_at IS NULL AND tenant = ? AND id = ?'
+    assert p == [5, 10]
+
+    q = sqlf(f'@SELECT {1}, {active}, {freeze(E.a.IN([1, 2]))}')
+    assert render(q, NumericQueryParams()) == (
+        'SELECT :1, WHERE deleted_at IS NULL AND tenant = :2, a IN :3',
+        [1, 5, [1, 2]],
+    )
+    assert render(q, NumericQueryParams(dedup='equality')) == (
+        'SELECT :1, WHERE deleted_at IS NULL AND tenant = :2, a IN :3',
+        [1, 5, [1, 2]],
+    )
+
+    op = next(iter(active)).value  # type: ignore[union-attr]
+    assert isinstance(op, FrozenOp)
+    shape = op.shape
+    assert shape is not None
+    assert Dialect().render(q) == (
+        'SELECT ?, WHERE deleted_at IS NULL AND tenant = ?, a IN ?',
+        [1, 5, [1, 2]],
+    )
+    assert op.shape is shape
+
+    plan = compile(lambda uid: sqlf(f'@SELECT * FROM t {active} AND id = {uid}'))
+    assert plan.bind(20) == (
+        'SELECT * FROM t WHERE deleted_at IS NULL AND tenant = ? AND id = ?',
+        [5, 20],
+    )
+
+
+def test_render_to() -> None:
+    data = [{'id': it, 'name': f'n{it}'} for it in range(100)]
+    q = SQL('INSERT INTO t ', Interpolation(VALUES(data)))
+    sql, params = render(q)
+
+    buf = io.StringIO()
+    assert Dialect().render_to(q, buf) == params
+    assert buf.getvalue() == sql
+
+    chunks: List[bytes] = []
+
+    class Writer(io.BytesIO):
+        def write(self, data: bytes) -> int:  # type: ignore[override]
+            chunks.append(data)
+            return len(data)
+
+    result = Dialect().render_to(
+        q, Writer(), NumericQueryParams(), encoding='utf-8', buffer_size=64
+    )
+    assert list(result) == params
+    assert b''.join(chunks) == render(q, NumericQueryParams())[0].encode()
+    assert len(chunks) > 10
+    assert max(map(len, chunks)) < 64 + 10
+
+    chunks.clear()
+    Dialect().render_to(EMPTY, Writer())
+    assert chunks == []
+
+
+def test_profile() -> None:
+    dialect = Dialect()
+    records: List[Dict[str, Any]] = []
+    q = WHERE(E.a == 1, E.b.IN([1, 2]), E.c.LIKE('{}%', 'x'))
+
+    with dialect.profile(records.append, maxsize=2) as profiler:
+        assert dialect.profiler is profiler
+        assert dialect.render(q) == render(q)
+        dialect.render(WHERE(E.a == 2, E.b.IN([3]), E.c.LIKE('{}%', 'y')), QMarkQueryParams([0]))
+        dialect.render(E.d == 1)
+        dialect.render(E.e == 1)
+        dialect.render_to(q, io.StringIO())
+        dialect.render(Template('SELECT ', Interpolation(1)))
+
+    assert dialect.profiler is None
+    assert len(records) == 6
+    assert records[0]['nodes'] == 7
+    assert records[1]['params'] == 3
+
+    # fingerprint is a shape, op output (IN list size) doesn't matter
+    key = 'WHERE a = ? AND {IN} AND {LIKE}'
+    stats = profiler.snapshot()
+    assert list(stats) == [key, 'd = ?', '<other>']
+    entry = stats[key]
+    assert entry['count'] == 3
+    assert entry['params'] == 9
+    assert entry['sql_length'] == 3 * len('WHERE a = ? AND b IN ? AND c LIKE ?')
+    assert entry['time'] > 0
+    assert {k: v['count'] for k, v in entry['ops'].items()} == {'IN_Op': 3, 'LIKE_Op': 3}
+    assert stats['<other>']['count'] == 2
+
+    stats['d = ?']['count'] = 10
+    assert profiler.snapshot()['d = ?']['count'] == 1
+    profiler.reset()
+    assert profiler.snapshot() == {}
@@ -1,6 +1,13 @@
+import io
+import math
+import sqlite3
+from datetime import date
+from decimal import Decimal
+from typing import List
+
 import pytest
 
-from sqlbind_t import E, sqlite
+from sqlbind_t import SQL, E, sqlf, sqlite
 
 dialect = sqlite.Dialect()
 dialect.IN_MAX_VALUES = 3
@@ -14,6 +21,114 @@ def test_IN() -> None:
         "val IN (1,'boo','bar','foo')",
         [],
     )
+    assert dialect.render(val.NOT_IN([])) == ('1', [])
+    assert dialect.render(val.NOT_IN([1])) == ('val NOT IN (?)', [1])
 
     with pytest.raises(ValueError, match='Invalid type'):
         dialect.render(val.IN([{}, 'boo', 'bar', 'foo']))
+
+
+def test_IN_json() -> None:
+    jdialect = sqlite.Dialect()
+    jdialect.IN_STRATEGY = 'json'
+    q = E.val.IN([1, 'boo'])
+    assert jdialect.render(q) == ('val IN (SELECT value FROM json_each(?))', ['[1, "boo"]'])
+    assert jdialect.render(E.val.IN([])) == ('0', [])
+
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE t (val)')
+    conn.executemany('INSERT INTO t VALUES (?)', [(1,), (2,), ('boo',)])
+    assert conn.execute(*jdialect.render(sqlf(f'@SELECT val FROM t WHERE {q}'))).fetchall() == [
+        (1,),
+        ('boo',),
+    ]
+
+    # values JSON can't keep are bound as is
+    assert jdialect.render(E.val.IN([None, True, 1.5])) == (
+        'val IN (SELECT value FROM json_each(?))',
+        ['[null, true, 1.5]'],
+    )
+    blob = E.val.IN([b'\x00', 'boo'])
+    assert jdialect.render(blob) == ('val IN (?, ?)', [b'\x00', 'boo'])
+    sql, values = jdialect.render(E.val.IN([float('nan')]))
+    assert sql == 'val IN (?)' and math.isnan(values[0])  # type: ignore[arg-type]
+    conn.execute('INSERT INTO t VALUES (?)', (b'\x00',))
+    assert conn.execute(*jdialect.render(sqlf(f'@SELECT val FROM t WHERE {blob}'))).fetchall() == [
+        ('boo',),
+        (b'\x00',),
+    ]
+    dates = [date(2020, 1, it) for it in range(1, 13)]
+    assert jdialect.render(E.val.IN(dates))[0].startswith("val IN ('2020-01-01','2020-01-02'")
+    assert jdialect.render(E.val.IN([Decimal('1.5')])) == ('val IN (?)', [Decimal('1.5')])
+
+    jdialect.IN_STRATEGY = 'unknown'
+    with pytest.raises(ValueError, match='Unknown IN strategy'):
+        jdialect.render(q)
+
+
+def test_render_to() -> None:
+    q = sqlf(f'@SELECT * FROM t WHERE {E.a.IN(range(5000))} AND {E.b.IN([1])}')
+    sql, params = dialect.render(q)
+    assert sql.endswith(',4999) AND b IN (?)')
+
+    writes: List[str] = []
+
+    class Writer(io.StringIO):
+        def write(self, data: str) -> int:
+            writes.append(data)
+            return len(data)
+
+    assert dialect.render_to(q, Writer(), buffer_size=64) == params
+    assert ''.join(writes) == sql
+    # a list is written by 1024 values, not as a single string
+    assert len(sql) > 20000
+    assert max(map(len, writes)) < 6000
+
+
+def test_IN_buckets() -> None:
+    bdialect = sqlite.Dialect()
+    bdialect.IN_MAX_VALUES = 6
+    bdialect.IN_BUCKETS = 'pow2'
+    val = E.val
+    assert bdialect.render(val.IN([1])) == ('val IN (?)', [1])
+    assert bdialect.render(val.IN([1, 2, 3])) == ('val IN (?, ?, ?, ?)', [1, 2, 3, 3])
+    assert bdialect.render(val.IN([1, 2, 3, 4, 5])) == (
+        'val IN (?, ?, ?, ?, ?, ?)',
+        [1, 2, 3, 4, 5, 5],
+    )
+
+    bdialect.IN_BUCKETS = (2, 5)
+    assert bdialect.render(val.IN([1])) == ('val IN (?, ?)', [1, 1])
+    assert bdialect.render(val.IN([1, 2, 3])) == ('val IN (?, ?, ?, ?, ?)', [1, 2, 3, 3, 3])
+    assert bdialect.render(val.IN([1, 2, 3, 4, 5, 6])) == (
+        'val IN (?, ?, ?, ?, ?, ?)',
+        [1, 2, 3, 4, 5, 6],
+    )
+
+    bdialect.IN_BUCKETS = 'unknown'
+    with pytest.raises(ValueError, match='Unknown IN buckets'):
+        bdialect.render(val.IN([1]))
+
+
+def test_render_many() -> None:
+    bdialect = sqlite.Dialect()
+    bdialect.IN_BUCKETS = 'pow2'
+
+    def query(uid: int, tags: List[int]) -> SQL:
+        return sqlf(f'@UPDATE t SET seen = 1 WHERE uid = {uid} AND {E.tag.IN(tags)}')
+
+    batches = bdialect.render_many(query, [(1, [1]), (2, [1, 2, 3]), (3, [2]), (4, [1, 2, 3, 4])])
+    assert batches == [
+        ('UPDATE t SET seen = 1 WHERE uid = ? AND tag IN (?)', [[1, 1], [3, 2]]),
+        (
+            'UPDATE t SET seen = 1 WHERE uid = ? AND tag IN (?, ?, ?, ?)',
+            [[2, 1, 2, 3, 3], [4, 1, 2, 3, 4]],
+        ),
+    ]
+
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE t (uid, tag, seen)')
+    conn.executemany('INSERT INTO t VALUES (?, ?, 0)', [(1, 1), (2, 3), (3, 1), (4, 5)])
+    for sql, params in batches:
+        conn.executemany(sql, params)
+    assert conn.execute('SELECT uid FROM t WHERE seen ORDER BY uid').fetchall() == [(1,), (2,)]
@@ -1,10 +1,22 @@
 import ast
+import os
+import sys
+from pathlib import Path
 from textwrap import dedent
 from typing import Any, Dict
 
 import pytest
 
-from sqlbind_t.tfstring import transform_fstrings
+from sqlbind_t.dialect import render
+from sqlbind_t.tfstring import (
+    TransformingLoader,
+    cache_path,
+    cache_tag,
+    main,
+    precompile,
+    transform_fstrings,
+    write_atomic,
+)
 
 
 def execute(source: str) -> Dict[str, Any]:
@@ -43,3 +55,94 @@ def test_type_check() -> None:
     )
     with pytest.raises(RuntimeError, match='prefixed f-string'):
         ctx['boo']('zoom')
+
+
+def test_bytecode_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+    source = tmp_path / 'mod.py'
+    source.write_text("from sqlbind_t import sqlf\nq = sqlf(f'@SELECT {10}')\n")
+
+    loader = TransformingLoader('mod', str(source), sigil='@')
+    code = loader.get_code('mod')
+    pyc = cache_path(str(source), cache_tag('@'))
+    assert pyc and os.path.exists(pyc)
+    assert cache_tag('@') != cache_tag('$')
+    assert cache_tag('@') != cache_tag('@', rewrite_pytest=True)
+
+    def fail(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError('should use cached bytecode')
+
+    monkeypatch.setattr(TransformingLoader, 'source_to_code', fail)
+    ctx: Dict[str, Any] = {}
+    exec(loader.get_code('mod'), ctx)
+    assert render(ctx['q']) == ('SELECT ?', [10])
+    monkeypatch.undo()
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+    assert loader.get_filename('mod') == str(source)
+
+    # stale cache is ignored and rewritten
+    source.write_text("from sqlbind_t import sqlf\nq = sqlf(f'@SELECT {20}, 1')\n")
+    ctx = {}
+    exec(loader.get_code('mod'), ctx)
+    assert render(ctx['q']) == ('SELECT ?, 1', [20])
+    assert code.co_filename == str(source)
+
+    # truncated cache
+    with open(pyc, 'r+b') as f:
+        f.truncate(20)
+    ctx = {}
+    exec(loader.get_code('mod'), ctx)
+    assert render(ctx['q']) == ('SELECT ?, 1', [20])
+
+    # cache write errors are ignored
+    def readonly(*args: Any) -> None:
+        raise OSError('read-only')
+
+    os.unlink(pyc)
+    monkeypatch.setattr(TransformingLoader, 'set_data', readonly)
+    ctx = {}
+    exec(loader.get_code('mod'), ctx)
+    assert render(ctx['q']) == ('SELECT ?, 1', [20])
+    assert not os.path.exists(pyc)
+
+
+def test_write_atomic(tmp_path: Path) -> None:
+    path = tmp_path / 'cache' / 'mod.pyc'
+    write_atomic(str(path), b'data')
+    assert path.read_bytes() == b'data'
+
+    # temporary file is unusable
+    (tmp_path / 'cache' / f'mod.pyc.{os.getpid()}.tmp').mkdir()
+    with pytest.raises(OSError):
+        write_atomic(str(path), b'new')
+    assert path.read_bytes() == b'data'
+
+
+def test_precompile(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    pkg = tmp_path / 'pkg'
+    (pkg / 'sub').mkdir(parents=True)
+    (pkg / '__init__.py').write_text('')
+    (pkg / 'sub' / 'mod.py').write_text("from sqlbind_t import sqlf\nq = sqlf(f'$SELECT {10}')\n")
+    (pkg / 'data.txt').write_text('')
+
+    assert main(['--verify', '-s', '$', str(pkg)]) == 1
+    assert capsys.readouterr().out.count('stale: ') == 2
+
+    assert main(['-s', '$', '-j', '2', '-o', '0', '-o', '1', str(pkg)]) == 0
+    assert main(['--verify', '-s', '$', '-o', '0', '-o', '1', str(pkg)]) == 0
+    assert main(['--verify', '-s', '@', str(pkg)]) == 1
+    capsys.readouterr()
+
+    source = pkg / 'sub' / 'mod.py'
+    assert precompile(str(source), '$') == (str(source), None)
+    monkeypatch.setattr(TransformingLoader, 'source_to_code', None)
+    ctx: Dict[str, Any] = {}
+    exec(TransformingLoader('pkg.sub.mod', str(source), sigil='$').get_code('pkg.sub.mod'), ctx)
+    assert render(ctx['q']) == ('SELECT ?', [10])
+
+    source.write_text("q = f'@SELECT {'\n")
+    assert main(['--verify', '-s', '$', str(source)]) == 1
+    assert main(['-s', '$', '-j', '1', str(source)]) == 1
+    assert 'SyntaxError' in capsys.readouterr().err